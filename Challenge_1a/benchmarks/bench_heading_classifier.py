@@ -0,0 +1,147 @@
+"""Micro-benchmark for the heading classification stage.
+
+Compares the per-line regex chain the outline extractor used to run
+(kept below as ``legacy_*``) with ``process_pdfs.classify_heading`` on the
+text elements of a synthetic document, and checks both agree.
+
+    python benchmarks/bench_heading_classifier.py --pages 500
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+import process_pdfs
+from synthetic_pdfs import make_numbered_pdf
+
+
+def legacy_is_numbered_heading(text):
+    patterns = [
+        r'^\d+\.\s+.+',
+        r'^\d+\.\d+\s+.+',
+        r'^\d+\.\d+\.\d+\s+.+',
+        r'^Chapter\s+\d+.*',
+        r'^Section\s+\d+.*',
+        r'^Part\s+\d+.*',
+    ]
+    for pattern in patterns:
+        if re.match(pattern, text.strip(), re.IGNORECASE):
+            return True
+    return False
+
+
+def legacy_is_exact_common_heading(text, match=None):
+    common_headings = [
+        "introduction", "overview", "conclusion", "summary", "references",
+        "bibliography", "acknowledgements", "table of contents", "abstract",
+        "methodology", "results", "discussion", "background", "literature review",
+        "revision history", "appendix", "glossary", "index"
+    ]
+    text_lower = text.lower().strip()
+    if match:
+        return text_lower == match
+    return text_lower in common_headings
+
+
+def legacy_is_table_or_form_label(text):
+    if re.match(r'^\d+\.?$', text.strip()):
+        return True
+    if re.match(r'^[A-Za-z]$', text.strip()):
+        return True
+    table_fields = [
+        "date", "name", "age", "s.no", "relationship", "signature", "remarks", "version", "identifier", "reference", "pay + si + npa"
+    ]
+    return text.lower().strip() in table_fields
+
+
+def legacy_determine_heading_level(text):
+    if re.match(r'^\d+\.\s+', text.strip()):
+        return "H1"
+    elif re.match(r'^\d+\.\d+\s+', text.strip()):
+        return "H2"
+    elif re.match(r'^\d+\.\d+\.\d+\s+', text.strip()):
+        return "H3"
+    if legacy_is_exact_common_heading(text):
+        return "H1"
+    return None
+
+
+def legacy_remove_title(candidates, title_lines):
+    def is_title_line(htext):
+        htext_norm = re.sub(r'\s+', ' ', htext.strip().lower())
+        return any(htext_norm == re.sub(r'\s+', ' ', t) for t in title_lines)
+    return [h for h in candidates if not is_title_line(h.text)]
+
+
+def legacy_classify(elements, title_lines):
+    candidates = []
+    for elem in elements:
+        text = elem.text
+        if len(text.strip()) > 200:
+            continue
+        if legacy_is_table_or_form_label(text):
+            continue
+        if legacy_is_numbered_heading(text) and len(text.strip()) <= 80:
+            candidates.append(elem)
+        elif legacy_is_exact_common_heading(text):
+            candidates.append(elem)
+    candidates = legacy_remove_title(candidates, title_lines)
+    result = []
+    for elem in candidates:
+        level = legacy_determine_heading_level(elem.text)
+        if level:
+            result.append((elem.text, level))
+    return result
+
+
+def compiled_classify(elements, title_lines):
+    candidates = []
+    for elem in elements:
+        classified = process_pdfs.classify_heading(elem.text)
+        if classified is None or classified[1] is None:
+            continue
+        candidates.append((elem, classified[1]))
+    keys = process_pdfs.title_keys(title_lines)
+    return [(e.text, level) for e, level in candidates if process_pdfs.heading_key(e.text) not in keys]
+
+
+def measure(func, elements, title_lines, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(elements, title_lines)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    doc = fitz.open(stream=make_numbered_pdf(args.pages), filetype="pdf")
+    elements = []
+    for page_num in range(doc.page_count):
+        elements.extend(process_pdfs.get_text_elements_from_page(doc[page_num], page_num + 1))
+    title = process_pdfs.extract_multi_line_title([e for e in elements if e.page == 1])
+    title_lines = [t.strip().lower() for t in process_pdfs.split_title_lines(title)]
+
+    legacy_time, legacy_result = measure(legacy_classify, elements, title_lines, args.repeat)
+    compiled_time, compiled_result = measure(compiled_classify, elements, title_lines, args.repeat)
+    if legacy_result != compiled_result:
+        sys.exit("classifier results differ from the legacy implementation")
+
+    print(f"{doc.page_count} pages, {len(elements)} lines, {len(compiled_result)} headings")
+    print(f"legacy:   {len(elements) / legacy_time:12,.0f} lines/sec")
+    print(f"compiled: {len(elements) / compiled_time:12,.0f} lines/sec ({legacy_time / compiled_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""End-to-end benchmark suite for extract_outline on synthetic PDFs.
+
+Every (document kind, page count) case runs in a fresh interpreter so its peak
+RSS is not polluted by earlier cases. Results can be saved as a baseline and
+later runs compared against it:
+
+    python benchmarks/bench_outline.py --save benchmarks/baseline.json
+    python benchmarks/bench_outline.py --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+DEFAULT_KINDS = ["toc", "numbered", "form"]
+DEFAULT_PAGES = [10, 50, 200, 1000, 2000]
+DEFAULT_PDF_DIR = os.path.join(tempfile.gettempdir(), "outline-bench-pdfs")
+# The README promises a 50-page PDF in under 10 seconds
+TIME_BUDGET_50_PAGES = 10.0
+
+
+def pdf_path_for(pdf_dir, kind, pages, seed):
+    return os.path.join(pdf_dir, f"{kind}-{pages}-s{seed}.pdf")
+
+
+def ensure_pdf(pdf_dir, kind, pages, seed):
+    from synthetic_pdfs import DOCUMENT_KINDS
+
+    path = pdf_path_for(pdf_dir, kind, pages, seed)
+    if not os.path.exists(path):
+        os.makedirs(pdf_dir, exist_ok=True)
+        data = DOCUMENT_KINDS[kind](pages, seed=seed)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return path
+
+
+def peak_rss_mb():
+    # VmHWM belongs to this exec'd image; ru_maxrss on Linux also carries the parent's peak over fork/exec
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def run_case(pdf_path, repeat, prefilter):
+    # Runs inside the child interpreter
+    import process_pdfs
+
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = process_pdfs.extract_outline(pdf_path, prefilter)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    process_pdfs.extract_outline(pdf_path, prefilter)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": min(times),
+        "outline_entries": len(result["outline"]),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "python_peak_mb": round(python_peak / (1024 * 1024), 2),
+    }
+
+
+def measure(pdf_dir, kind, pages, seed, repeat, prefilter):
+    path = ensure_pdf(pdf_dir, kind, pages, seed)
+    cmd = [sys.executable, "-W", "ignore", os.path.abspath(__file__), "--child", path,
+           "--repeat", str(repeat)]
+    if prefilter:
+        cmd.append("--prefilter")
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    case = json.loads(out.strip().splitlines()[-1])
+    case["pages"] = pages
+    case["pages_per_sec"] = round(pages / case["seconds"], 1) if case["seconds"] > 0 else None
+    case["seconds"] = round(case["seconds"], 4)
+    return case
+
+
+def compare(results, baseline, tolerance, min_delta):
+    regressions = []
+    for name, case in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        ratio = case["seconds"] / base["seconds"] if base["seconds"] else 1.0
+        rss_ratio = case["peak_rss_mb"] / base["peak_rss_mb"] if base["peak_rss_mb"] else 1.0
+        flag = ""
+        slower = ratio > 1 + tolerance and case["seconds"] - base["seconds"] > min_delta
+        if slower or rss_ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<16} time {ratio:6.2f}x  rss {rss_ratio:6.2f}x  vs baseline{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kinds", nargs="+", default=DEFAULT_KINDS, choices=DEFAULT_KINDS)
+    parser.add_argument("--pages", nargs="+", type=int, default=DEFAULT_PAGES)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--prefilter", action="store_true", help="benchmark extract_outline(prefilter=True)")
+    parser.add_argument("--pdf-dir", default=DEFAULT_PDF_DIR, help="where generated PDFs are cached")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a saved baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown/RSS growth before a case counts as a regression")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="seconds a case must also lose before a slowdown counts, to ignore noise on tiny cases")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(args.child, args.repeat, args.prefilter)))
+        return
+
+    import fitz
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "pymupdf": fitz.VersionBind,
+            "machine": platform.machine(),
+            "prefilter": args.prefilter,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "cases": {},
+    }
+    print(f"{'case':<16}{'seconds':>10}{'pages/s':>10}{'rss MB':>9}{'py MB':>8}{'entries':>9}")
+    for kind in args.kinds:
+        for pages in args.pages:
+            name = f"{kind}-{pages}"
+            case = measure(args.pdf_dir, kind, pages, args.seed, args.repeat, args.prefilter)
+            results["cases"][name] = case
+            print(f"{name:<16}{case['seconds']:>10.3f}{case['pages_per_sec']:>10.0f}"
+                  f"{case['peak_rss_mb']:>9.1f}{case['python_peak_mb']:>8.2f}{case['outline_entries']:>9}")
+
+    for kind in args.kinds:
+        case = results["cases"].get(f"{kind}-50")
+        if case and case["seconds"] > TIME_BUDGET_50_PAGES:
+            print(f"{kind}-50 took {case['seconds']:.2f}s, over the {TIME_BUDGET_50_PAGES:.0f}s budget")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance, args.min_delta):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
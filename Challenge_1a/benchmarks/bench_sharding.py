@@ -0,0 +1,62 @@
+"""Speedup of sharded extract_outline against shard count on one long synthetic PDF.
+
+Every shard count must reproduce the serial outline exactly; a mismatch fails
+the run.
+
+    python benchmarks/bench_sharding.py --pages 3000 --shards 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from bench_outline import DEFAULT_PDF_DIR, ensure_pdf  # noqa: E402
+
+
+def best_time(func, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=3000)
+    parser.add_argument("--shards", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--kind", default="numbered", choices=["numbered", "form"])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per shard count, the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--prefilter", action="store_true")
+    parser.add_argument("--pdf-dir", default=DEFAULT_PDF_DIR, help="where generated PDFs are cached")
+    args = parser.parse_args()
+
+    import process_pdfs
+
+    path = ensure_pdf(args.pdf_dir, args.kind, args.pages, args.seed)
+    print(f"{args.kind}-{args.pages} on {os.cpu_count()} CPU(s)")
+    serial_seconds, expected = best_time(lambda: process_pdfs.extract_outline(path, args.prefilter), args.repeat)
+    print(f"{'shards':>6}{'seconds':>10}{'speedup':>9}")
+    print(f"{'serial':>6}{serial_seconds:>10.3f}{1.0:>8.2f}x")
+
+    mismatches = []
+    for shards in args.shards:
+        seconds, result = best_time(
+            lambda: process_pdfs.extract_outline(path, args.prefilter, shards=shards), args.repeat)
+        flag = "" if result == expected else "  MISMATCH"
+        if flag:
+            mismatches.append(shards)
+        print(f"{shards:>6}{seconds:>10.3f}{serial_seconds / seconds:>8.2f}x{flag}")
+
+    if mismatches:
+        sys.exit(f"sharded output differs from serial for shard counts {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import random
+
+import fitz  # PyMuPDF
+
+WORDS = (
+    "document analysis section data process system value result method model "
+    "report review design table figure support detail policy service project "
+    "record input output number level layout format version update summary"
+).split()
+
+BODY_FONT_SIZE = 10
+HEADING_FONT_SIZE = 14
+TITLE_FONT_SIZE = 24
+LINE_HEIGHT = 14
+TOP_MARGIN = 72
+BOTTOM_MARGIN = 72
+
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+class _Writer:
+    # Buffers a page worth of lines in a TextWriter; one insert_text per line is far slower
+    def __init__(self, doc):
+        self.doc = doc
+        self.fonts = {False: fitz.Font("helv"), True: fitz.Font("hebo")}
+        self.page = None
+        self.text_writer = None
+        self.y = 0
+
+    def new_page(self):
+        self.flush()
+        self.page = self.doc.new_page()
+        self.text_writer = fitz.TextWriter(self.page.rect)
+        self.y = TOP_MARGIN
+
+    def flush(self):
+        if self.text_writer is not None:
+            self.text_writer.write_text(self.page)
+            self.text_writer = None
+
+    def line(self, text, size=BODY_FONT_SIZE, bold=False):
+        if self.page is None or self.y > self.page.rect.height - BOTTOM_MARGIN:
+            self.new_page()
+        self.text_writer.append((72, self.y), text, font=self.fonts[bold], fontsize=size)
+        self.y += max(LINE_HEIGHT, size + 4)
+
+
+def _write_chapters(writer, rng, pages, lines_per_page):
+    # Numbered H1-H3 structure with body text until the document reaches ``pages`` pages.
+    # Returns the headings as (level, text, page) for documents that embed a TOC.
+    doc = writer.doc
+    headings = []
+
+    def heading(level, text, size):
+        writer.line(text, size=size, bold=True)
+        headings.append((level, text, doc.page_count))
+
+    chapter = 0
+    while doc.page_count < pages or writer.y <= writer.page.rect.height - BOTTOM_MARGIN:
+        chapter += 1
+        heading(1, f"{chapter}. {_sentence(rng, 3)}", HEADING_FONT_SIZE)
+        for section in range(1, 4):
+            heading(2, f"{chapter}.{section} {_sentence(rng, 4)}", HEADING_FONT_SIZE - 2)
+            for sub in range(1, 3):
+                heading(3, f"{chapter}.{section}.{sub} {_sentence(rng, 4)}", HEADING_FONT_SIZE - 3)
+                for _ in range(lines_per_page // 8):
+                    writer.line(_sentence(rng))
+            if doc.page_count > 1:
+                # Table-cell noise the classifier must reject; kept off page 1 so form detection stays quiet
+                writer.line(str(rng.randint(1, 99)))
+                writer.line(rng.choice(["Date", "Name", "Version", "Remarks"]))
+        if doc.page_count >= pages:
+            break
+    return headings
+
+
+def _finish(doc, pages):
+    while doc.page_count > pages:
+        doc.delete_page(-1)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_numbered_pdf(pages, seed=0, lines_per_page=40):
+    # Document without an embedded TOC, so extract_outline takes the text-analysis path
+    rng = random.Random(seed)
+    doc = fitz.open()
+    writer = _Writer(doc)
+    writer.new_page()
+    writer.line("Synthetic Benchmark Document", size=TITLE_FONT_SIZE, bold=True)
+    writer.line("Overview", size=HEADING_FONT_SIZE, bold=True)
+    _write_chapters(writer, rng, pages, lines_per_page)
+    writer.flush()
+    return _finish(doc, pages)
+
+
+def make_toc_pdf(pages, seed=0, lines_per_page=40):
+    # Same layout with an embedded outline, so extract_outline takes the get_toc path
+    rng = random.Random(seed)
+    doc = fitz.open()
+    writer = _Writer(doc)
+    writer.new_page()
+    writer.line("Synthetic Benchmark Document", size=TITLE_FONT_SIZE, bold=True)
+    headings = _write_chapters(writer, rng, pages, lines_per_page)
+    writer.flush()
+    while doc.page_count > pages:
+        doc.delete_page(-1)
+    doc.set_toc([[level, text, page] for level, text, page in headings if page <= pages])
+    return _finish(doc, pages)
+
+
+def make_form_pdf(pages, seed=0, lines_per_page=40):
+    # Form-like first page (numbered fields, table labels), so text analysis stops after page 1
+    rng = random.Random(seed)
+    doc = fitz.open()
+    writer = _Writer(doc)
+    writer.new_page()
+    writer.line("Application Form for Synthetic Benchmark", size=TITLE_FONT_SIZE, bold=True)
+    for number, label in enumerate(["Name", "Date", "Designation", "Signature", "Remarks", "Age"], 1):
+        writer.line(f"{number}.")
+        writer.line(label)
+        writer.line(_sentence(rng, 5))
+    writer.new_page()
+    _write_chapters(writer, rng, pages, lines_per_page)
+    writer.flush()
+    return _finish(doc, pages)
+
+
+DOCUMENT_KINDS = {
+    "toc": make_toc_pdf,
+    "numbered": make_numbered_pdf,
+    "form": make_form_pdf,
+}
@@ -0,0 +1,73 @@
+from process_pdfs import (EXTRACTOR_VERSION, TextLine, extract_outline_from_document, get_text_elements_from_page,
+                          open_document)
+
+# Part of the model cache key, so cached models are rebuilt whenever the extractor changes
+MODEL_VERSION = EXTRACTOR_VERSION + "-model-1"
+
+
+class DocumentModel:
+    """Everything both pipelines need from one PyMuPDF parse of a PDF.
+
+    ``pages`` holds ``(page_num, lines)`` for every page, where each line is a
+    TextLine with its font size, bold flag and vertical position. ``title``
+    and ``outline`` are what extract_outline returns for the same document,
+    computed from those lines instead of a second parse. ``to_dict`` and
+    ``from_dict`` round-trip through JSON, so models can be cached like outlines.
+    """
+
+    def __init__(self, title, outline, pages, page_count):
+        self.title = title
+        self.outline = outline
+        self.pages = pages
+        self.page_count = page_count
+
+    def outline_data(self):
+        return {"title": self.title, "outline": [dict(entry) for entry in self.outline]}
+
+    def iter_lines(self):
+        for _, lines in self.pages:
+            yield from lines
+
+    def page_text(self, page_num):
+        return "\n".join(line.text.rstrip() for line in self.pages[page_num - 1][1])
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "outline": self.outline,
+            "page_count": self.page_count,
+            "pages": [[page_num, [[line.text, line.font_size, line.is_bold, line.y_position] for line in lines]]
+                      for page_num, lines in self.pages],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        pages = [(page_num, [TextLine(text, page_num, font_size, is_bold, y_position)
+                             for text, font_size, is_bold, y_position in lines])
+                 for page_num, lines in data["pages"]]
+        return cls(data["title"], data["outline"], pages, data["page_count"])
+
+
+def build_document_model(source):
+    # source: anything extract_outline accepts. Every page is extracted once; the outline reuses those lines
+    doc = open_document(source)
+    try:
+        pages = [(page_num + 1, get_text_elements_from_page(doc[page_num], page_num + 1))
+                 for page_num in range(doc.page_count)]
+        data = extract_outline_from_document(doc, pages=pages)
+        return DocumentModel(data["title"], data["outline"], pages, doc.page_count)
+    finally:
+        doc.close()
+
+
+def load_document_model(pdf_path, cache=None):
+    # Returns (model, served from cache); cache is a ResultCache created with MODEL_VERSION
+    if cache is None:
+        return build_document_model(pdf_path), False
+    key = cache.key_for(pdf_path)
+    data = cache.get(key)
+    if data is not None:
+        return DocumentModel.from_dict(data), True
+    model = build_document_model(pdf_path)
+    cache.put(key, model.to_dict())
+    return model, False
@@ -0,0 +1,118 @@
+import cProfile
+import time
+import tracemalloc
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullTimer:
+    # Stand-in used when instrumentation is off; every hook is a constant-time no-op
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def count(self, name, n=1):
+        pass
+
+    def note(self, name, value):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+class _Stage:
+    __slots__ = ("timer", "name")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer._enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.timer._exit()
+        return False
+
+
+class StageTimer:
+    """Accumulates exclusive wall time per named stage plus simple counters.
+
+    Stages may nest; time spent in an inner stage is not charged to the outer
+    one, so the per-stage numbers add up to the instrumented total.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.stages = {}
+        self.counts = {}
+        self.notes = {}
+        self._stack = []
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def count(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def note(self, name, value):
+        self.notes[name] = value
+
+    def _enter(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self._charge(parent[0], now - parent[1])
+        self._stack.append([name, now])
+
+    def _exit(self):
+        now = time.perf_counter()
+        name, resumed = self._stack.pop()
+        self._charge(name, now - resumed)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def _charge(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def as_dict(self):
+        stages = {name: round(seconds, 6) for name, seconds in self.stages.items()}
+        return dict(self.notes, stages=stages, total_seconds=round(sum(self.stages.values()), 6),
+                    counts=dict(self.counts))
+
+
+def profile_call(func, args, prof_path, tracemalloc_path=None, top=25):
+    # Runs func(*args) under cProfile (and tracemalloc when a report path is given)
+    profiler = cProfile.Profile()
+    if tracemalloc_path:
+        tracemalloc.start(10)
+    try:
+        profiler.enable()
+        try:
+            return func(*args)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(prof_path)
+            if tracemalloc_path:
+                snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, cProfile.__file__)])
+                current, peak = tracemalloc.get_traced_memory()
+                with open(tracemalloc_path, "w", encoding="utf-8") as f:
+                    f.write(f"current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n")
+                    for stat in snapshot.statistics("lineno")[:top]:
+                        f.write(f"{stat}\n")
+    finally:
+        if tracemalloc_path:
+            tracemalloc.stop()
@@ -0,0 +1,86 @@
+import glob
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # stdlib json is slower but produces equivalent records
+    orjson = None
+
+BUFFER_SIZE = 1 << 20
+
+
+def dumps_line(record):
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class JsonlWriter:
+    """Appends one JSON record per processed PDF to a single JSONL file or to rotated shards.
+
+    Writes go through a large buffer; data is flushed and fsynced only at batch
+    boundaries (``sync``/``close``) and when a shard is rotated out. With
+    ``max_bytes`` set, records go to ``<prefix>-00000.jsonl``, ``-00001`` and so
+    on, and a new run keeps appending to the newest shard.
+    """
+
+    def __init__(self, output_dir, prefix="outlines", max_bytes=None):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.records = 0
+        self._index = self._last_shard() if max_bytes else None
+        self._file = None
+        self._size = 0
+        self._open()
+
+    @property
+    def path(self):
+        if self._index is None:
+            return os.path.join(self.output_dir, f"{self.prefix}.jsonl")
+        return os.path.join(self.output_dir, f"{self.prefix}-{self._index:05d}.jsonl")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _last_shard(self):
+        shards = glob.glob(os.path.join(glob.escape(self.output_dir), f"{glob.escape(self.prefix)}-*.jsonl"))
+        indices = [int(name[-11:-6]) for name in shards if name[-11:-6].isdigit()]
+        return max(indices, default=0)
+
+    def _open(self):
+        self._file = open(self.path, "ab", buffering=BUFFER_SIZE)
+        self._size = self._file.tell()
+
+    def write_outline(self, data, filename, output_dir=None):
+        # Same call shape as process_pdfs.write_outline so either can be the sink
+        if not data:
+            data = {"title": "Untitled Document", "outline": []}
+        self.write_record(dict(file=filename, status="ok", **data))
+
+    def write_error(self, filename, status, message):
+        self.write_record({"file": filename, "status": status, "error": str(message)})
+
+    def write_record(self, record):
+        line = dumps_line(record)
+        if self.max_bytes and self._size and self._size + len(line) > self.max_bytes:
+            self.sync()
+            self._file.close()
+            self._index += 1
+            self._open()
+        self._file.write(line)
+        self._size += len(line)
+        self.records += 1
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None and not self._file.closed:
+            self.sync()
+            self._file.close()
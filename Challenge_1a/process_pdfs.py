@@ -1,238 +1,444 @@
 import fitz  # PyMuPDF
+import io
+import itertools
+import mmap
+import os
 import re
 
-PAGE_OFFSET = -1
-
-def extract_outline(pdf_path):
-    doc = fitz.open(pdf_path)
+from instrumentation import NULL_TIMER, StageTimer, profile_call
+from worker_pool import WorkerPool, STATUS_OK, STATUS_ERROR
 
+PAGE_OFFSET = -1
+# Bump whenever a change can alter extracted outlines; it is part of the result cache key
+EXTRACTOR_VERSION = "1a-1"
+# Sharded extraction: pages per shard at least, and shards queued per worker for load balancing
+SHARD_MIN_PAGES = 50
+SHARDS_PER_WORKER = 4
+
+def extract_outline(source, prefilter=False, timer=NULL_TIMER, shards=1):
+    # source: a path, bytes-like object (bytes, bytearray, memoryview, mmap) or binary file object
+    with timer.stage("open"):
+        doc = open_document(source)
+    return extract_outline_from_document(doc, prefilter, timer, shards)
+
+def extract_outline_from_bytes(pdf_bytes, prefilter=False):
+    # Opens the document straight from memory, no temp file
+    return extract_outline(pdf_bytes, prefilter)
+
+def extract_outlines(items, prefilter=False):
+    # Batch API over (name, source) pairs; yields (name, status, outline or error message)
+    for name, source in items:
+        try:
+            yield name, STATUS_OK, extract_outline(source, prefilter)
+        except Exception as e:
+            yield name, STATUS_ERROR, str(e)
+
+def open_document(source):
+    if isinstance(source, (str, os.PathLike)):
+        return fitz.open(source)
+    return fitz.open(stream=pdf_buffer(source), filetype="pdf")
+
+def pdf_buffer(source):
+    # PyMuPDF reads bytes and memoryviews in place but copies anything else,
+    # so every other input is turned into a memoryview over its own memory
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (bytearray, mmap.mmap)):
+        return memoryview(source)
+    if isinstance(source, memoryview):
+        return source if source.format == "B" and source.contiguous else memoryview(source.tobytes())
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer()
+    try:
+        # Real files are mapped rather than read
+        return memoryview(mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ))
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return source.read()
+
+def extract_outline_from_document(doc, prefilter=False, timer=NULL_TIMER, shards=1, pages=None):
+    # pages: (page_num, elements) for every page, already extracted (see document_model); nothing is re-parsed
+    timer.count("pages", doc.page_count)
     # Try built-in TOC first
-    toc = doc.get_toc()
+    with timer.stage("get_toc"):
+        toc = doc.get_toc()
     if toc and len(toc) > 0:
-        return extract_from_toc(doc, toc)
+        timer.note("path", "toc")
+        return extract_from_toc(doc, toc, timer, pages)
 
     # Fallback to text analysis
-    return extract_from_text_analysis(doc)
+    return extract_from_text_analysis(doc, prefilter=prefilter, timer=timer, shards=shards, pages=pages)
+
+def run_extraction(pdf_path, prefilter=False, cache=None, collect_metrics=False, profile_path=None, shards=1,
+                   model_cache=None):
+    # Returns (outline data, served from cache, stage metrics or None)
+    timer = StageTimer() if collect_metrics else NULL_TIMER
+    if model_cache is not None:
+        # The outline comes from the shared document model, which is stored for the persona pipeline to reuse
+        from document_model import load_document_model
+        with timer.stage("document_model"):
+            model, cache_hit = load_document_model(pdf_path, model_cache)
+        timer.note("path", "model_cache" if cache_hit else "model")
+        return model.outline_data(), cache_hit, timer.as_dict() if timer.enabled else None
+
+    if cache is not None:
+        with timer.stage("cache_lookup"):
+            key = cache.key_for(pdf_path)
+            data = cache.get(key)
+        if data is not None:
+            timer.note("path", "cache")
+            return data, True, timer.as_dict() if timer.enabled else None
+
+    if profile_path:
+        data = profile_call(extract_outline, (pdf_path, prefilter, timer, shards),
+                            profile_path + ".prof", profile_path + ".tracemalloc.txt")
+    else:
+        data = extract_outline(pdf_path, prefilter, timer, shards)
 
-def extract_from_toc(doc, toc):
+    if cache is not None:
+        with timer.stage("cache_store"):
+            cache.put(key, data)
+    return data, False, timer.as_dict() if timer.enabled else None
+
+def extract_from_toc(doc, toc, timer=NULL_TIMER, pages=None):
     outline = []
     title = "Untitled Document"
     if doc.page_count > 0:
-        first_page = doc[0]
-        first_page_elements = get_text_elements_from_page(first_page)
-        title = extract_multi_line_title(first_page_elements)
-
-    for level, heading, page_num in toc:
-        if level <= 3:
-            heading_level = f"H{level}"
-            outline.append({
-                "level": heading_level,
-                "text": heading,
-                "page": page_num
-            })
-    outline = remove_title_headings(outline, title)
-    outline = [normalize_heading_text(h) for h in outline]
+        with timer.stage("get_text"):
+            first_page_elements = pages[0][1] if pages else get_text_elements_from_page(doc[0])
+        timer.count("pages_extracted")
+        timer.count("text_elements", len(first_page_elements))
+        with timer.stage("title"):
+            title = extract_multi_line_title(first_page_elements)
+
+    with timer.stage("outline_assembly"):
+        for level, heading, page_num in toc:
+            if level <= 3:
+                heading_level = f"H{level}"
+                outline.append({
+                    "level": heading_level,
+                    "text": heading,
+                    "page": page_num
+                })
+        outline = remove_title_headings(outline, title)
+        outline = [normalize_heading_text(h) for h in outline]
+    timer.count("outline_entries", len(outline))
     return {"title": title, "outline": outline}
 
-def extract_from_text_analysis(doc):
-    all_text_elements = []
-    for page_num in range(doc.page_count):
-        page = doc[page_num]
-        all_text_elements.extend(get_text_elements_from_page(page, page_num + 1))
-
-    if not all_text_elements:
+def extract_from_text_analysis(doc, prefilter=False, timer=NULL_TIMER, shards=1, pages=None):
+    timer.note("path", "text")
+    if doc.page_count == 0:
         return {"title": "Untitled Document", "outline": []}
 
-    # Title: concatenate top-most, largest-font lines on first page
-    first_page_elements = [elem for elem in all_text_elements if elem["page"] == 1]
-    title = extract_multi_line_title(first_page_elements)
-    title_lines = [t.strip().lower() for t in split_title_lines(title)]
+    # Title and form detection only need page 1, so forms return before the rest is parsed
+    with timer.stage("get_text"):
+        first_page_elements = pages[0][1] if pages else get_text_elements_from_page(doc[0], 1)
+    timer.count("pages_extracted")
+    timer.count("text_elements", len(first_page_elements))
+    with timer.stage("title"):
+        title = extract_multi_line_title(first_page_elements)
+        title_lines = [t.strip().lower() for t in split_title_lines(title)]
 
     # --- FORM DETECTION ---
-    if is_form_document(title, all_text_elements):
+    with timer.stage("form_detection"):
+        is_form = is_form_document(title, first_page_elements)
+    if is_form:
+        timer.note("path", "form")
         return {"title": title, "outline": []}
 
-    # Find TOC pages (pages containing "Table of Contents" as a heading)
-    toc_pages = set()
-    for elem in all_text_elements:
-        if is_exact_common_heading(elem["text"], "table of contents"):
-            toc_pages.add(elem["page"])
-
-    # Heading candidates: only numbered headings or exact common heading keywords, not in TOC pages
-    heading_candidates = []
-    for elem in all_text_elements:
-        text = elem["text"]
-        # Allow "Table of Contents" heading even if on TOC page
-        if elem["page"] in toc_pages and not is_exact_common_heading(text, "table of contents"):
-            continue
-        if len(text.strip()) > 200:
-            continue
-        if is_table_or_form_label(text):
-            continue
-        # Only include numbered headings if they are not too long (avoid list items)
-        if is_numbered_heading(text) and len(text.strip()) <= 80:
-            elem["confidence"] = 10
-            heading_candidates.append(elem)
-        elif is_exact_common_heading(text):
-            elem["confidence"] = 10
-            heading_candidates.append(elem)
-
-    heading_candidates = remove_title_from_headings(heading_candidates, title_lines)
-    heading_candidates = remove_duplicate_headings(heading_candidates)
-    heading_candidates.sort(key=lambda x: (x["page"], x["y_position"]))
-
-    outline = []
-    for elem in heading_candidates:
-        level = determine_heading_level(elem["text"])
-        if level:
+    keys = title_keys(title_lines)
+    ranges = shard_ranges(1, doc.page_count, shards) if shards > 1 and doc.name and not pages else []
+    # Page extraction inside the stream is charged to get_text/prefilter, not to this stage
+    with timer.stage("candidate_filtering"):
+        if pages:
+            rest = iter_page_candidates(pages[1:], keys)
+        elif len(ranges) > 1:
+            with timer.stage("sharded_extraction"):
+                rest = extract_sharded_candidates(doc.name, ranges, keys, shards, prefilter)
+            timer.count("shards", len(ranges))
+        else:
+            rest = iter_page_candidates(iter_page_elements(doc, start=1, prefilter=prefilter, timer=timer), keys)
+        candidates = itertools.chain(iter_page_candidates([(1, first_page_elements)], keys), rest)
+        heading_candidates = list(dedupe_heading_candidates(candidates))
+    timer.count("heading_candidates", len(heading_candidates))
+
+    with timer.stage("outline_assembly"):
+        heading_candidates.sort(key=lambda x: (x.page, x.y_position))
+
+        outline = []
+        for elem in heading_candidates:
             outline.append({
-                "level": level,
-                "text": elem["text"],
-                "page": elem["page"] + PAGE_OFFSET,
-                "y_position": elem["y_position"]
+                "level": elem.level,
+                "text": elem.text,
+                "page": elem.page + PAGE_OFFSET,
+                "y_position": elem.y_position
             })
 
-    outline = [h for h in outline if h["page"] > 0]  # Remove any with page < 1
-    outline.sort(key=lambda x: (x["page"], x["y_position"]))
-    for o in outline:
-        o.pop("y_position", None)
+        outline = [h for h in outline if h["page"] > 0]  # Remove any with page < 1
+        outline.sort(key=lambda x: (x["page"], x["y_position"]))
+        for o in outline:
+            o.pop("y_position", None)
 
-    outline = remove_title_headings(outline, title)
-    outline = [normalize_heading_text(h) for h in outline]
+        outline = remove_title_headings(outline, title)
+        outline = [normalize_heading_text(h) for h in outline]
+    timer.count("outline_entries", len(outline))
 
     return {"title": title, "outline": outline}
 
-def get_text_elements_from_page(page, page_num=1):
+def shard_ranges(start, stop, shards):
+    # Contiguous 0-based page ranges, several per worker so one slow range does not idle the rest
+    size = max(SHARD_MIN_PAGES, -(-(stop - start) // (shards * SHARDS_PER_WORKER)))
+    return [(first, min(first + size, stop)) for first in range(start, stop, size)]
+
+def extract_shard_candidates(pdf_path, start, stop, keys, prefilter=False):
+    # Runs in a shard worker; the document-wide dedupe is left to the parent
+    doc = fitz.open(pdf_path)
+    return list(iter_page_candidates(iter_page_elements(doc, start, prefilter, stop=stop), keys))
+
+def extract_sharded_candidates(pdf_path, ranges, keys, shards, prefilter=False):
+    # Shard results are stitched back in page order, so the merge sees the same stream as the serial path
+    results = {}
+    tasks = [(i, pdf_path, start, stop, keys, prefilter) for i, (start, stop) in enumerate(ranges)]
+    with WorkerPool(extract_shard_candidates, workers=min(shards, len(ranges))) as pool:
+        for i, status, payload, _ in pool.run(tasks):
+            if status != STATUS_OK:
+                start, stop = ranges[i]
+                raise RuntimeError(f"pages {start + 1}-{stop} failed ({status}): {payload}")
+            results[i] = payload
+    return itertools.chain.from_iterable(results[i] for i in range(len(ranges)))
+
+def iter_page_elements(doc, start=0, prefilter=False, timer=NULL_TIMER, stop=None):
+    for page_num in range(start, doc.page_count if stop is None else stop):
+        page = doc[page_num]
+        textpage = None
+        if prefilter:
+            # Cheap pass: plain text from the textpage the span extraction would build anyway.
+            # Image blocks stay enabled because they change how MuPDF splits lines.
+            with timer.stage("prefilter"):
+                textpage = page.get_textpage(flags=fitz.TEXTFLAGS_DICT)
+                keep = page_may_have_headings(textpage.extractText())
+            if not keep:
+                continue
+        with timer.stage("get_text"):
+            elements = get_text_elements_from_page(page, page_num + 1, textpage)
+        timer.count("pages_extracted")
+        timer.count("text_elements", len(elements))
+        yield page_num + 1, elements
+
+def page_may_have_headings(page_text):
+    # Span texts are joined with extra spaces later, so compare with whitespace removed.
+    # This may keep pages without headings but never drops a page that has one.
+    for line in page_text.split("\n"):
+        stripped = line.lstrip()
+        if not stripped or not (stripped[0].isdigit() or stripped[0].lower()[:1] in PREFILTER_FIRST_CHARS):
+            continue
+        compact = "".join(stripped.split())
+        if len(compact) <= 80 and PREFILTER_RE.match(compact):
+            return True
+        if compact.lower() in COMMON_HEADING_KEYS:
+            return True
+    return False
+
+def dedupe_heading_candidates(candidates):
+    # Document-wide: the first occurrence of a heading text wins
+    seen_texts = set()
+    for elem in candidates:
+        text_normalized = heading_key(elem.text)
+        if text_normalized in seen_texts:
+            continue
+        seen_texts.add(text_normalized)
+        yield elem
+
+def iter_page_candidates(pages, keys):
+    # Per-page filtering only, so page ranges can be classified independently
+    for page_num, elements in pages:
+        # TOC pages (pages containing "Table of Contents" as a heading) only keep that heading
+        is_toc_page = any(is_exact_common_heading(e.text, "table of contents") for e in elements)
+        for elem in elements:
+            text = elem.text
+            if is_toc_page and not is_exact_common_heading(text, "table of contents"):
+                continue
+            # Heading candidates: only numbered headings or exact common heading keywords
+            classified = classify_heading(text)
+            if classified is None or classified[1] is None:
+                continue
+            if heading_key(text) in keys:
+                continue
+            elem.confidence, elem.level = classified
+            yield elem
+
+class TextLine:
+    # One extracted line; __slots__ keeps these far smaller than a dict per line on long documents
+    __slots__ = ("text", "page", "font_size", "is_bold", "y_position", "confidence", "level")
+
+    def __init__(self, text, page, font_size, is_bold, y_position):
+        self.text = text
+        self.page = page
+        self.font_size = font_size
+        self.is_bold = is_bold
+        self.y_position = y_position
+        self.confidence = 0
+        self.level = None
+
+    def __repr__(self):
+        return f"TextLine({self.text!r}, page={self.page}, font_size={self.font_size}, y={self.y_position})"
+
+def get_text_elements_from_page(page, page_num=1, textpage=None):
     elements = []
-    blocks = page.get_text("dict")["blocks"]
+    blocks = page.get_text("dict", textpage=textpage)["blocks"]
     for block in blocks:
         if "lines" not in block:
             continue
         for line in block["lines"]:
-            full_text = ""
+            texts = []
             font_sizes = []
             is_bold = False
             for span in line["spans"]:
                 text = span["text"]
                 if text:
-                    full_text += text + " "
+                    texts.append(text)
                     font_sizes.append(span["size"])
                     if span["flags"] & 2**4:
                         is_bold = True
-            full_text = full_text.rstrip('\n')
-            if full_text and len(full_text.strip()) > 1:
-                avg_font_size = sum(font_sizes) / len(font_sizes) if font_sizes else 12
-                elements.append({
-                    "text": full_text,
-                    "page": page_num,
-                    "font_size": round(avg_font_size, 1),
-                    "is_bold": is_bold,
-                    "y_position": line["bbox"][1] if line.get("bbox") else 0
-                })
+            if not texts:
+                continue
+            full_text = " ".join(texts) + " "
+            if len(full_text.strip()) > 1:
+                avg_font_size = sum(font_sizes) / len(font_sizes)
+                elements.append(TextLine(
+                    full_text,
+                    page_num,
+                    round(avg_font_size, 1),
+                    is_bold,
+                    line["bbox"][1] if line.get("bbox") else 0
+                ))
     return elements
 
 def extract_multi_line_title(first_page_elements):
     if not first_page_elements:
         return "Untitled Document"
-    max_font = max(e["font_size"] for e in first_page_elements)
-    title_lines = [e for e in first_page_elements if abs(e["font_size"] - max_font) < 0.1]
-    title_lines.sort(key=lambda x: x["y_position"])
-    title = "".join([e["text"] for e in title_lines])
+    max_font = max(e.font_size for e in first_page_elements)
+    title_lines = [e for e in first_page_elements if abs(e.font_size - max_font) < 0.1]
+    title_lines.sort(key=lambda x: x.y_position)
+    title = "".join([e.text for e in title_lines])
     return title
 
 def split_title_lines(title):
     # Split title into lines for matching
     return [line for line in re.split(r' {2,}|\n', title) if line.strip()]
 
+FORM_KEYWORDS = ("form", "application", "request", "certificate", "registration", "claim", "report", "invoice")
+TABLE_FIELDS = frozenset([
+    "date", "name", "age", "s.no", "relationship", "signature", "remarks", "version", "identifier", "reference", "pay + si + npa"
+])
+COMMON_HEADINGS = frozenset([
+    "introduction", "overview", "conclusion", "summary", "references",
+    "bibliography", "acknowledgements", "table of contents", "abstract",
+    "methodology", "results", "discussion", "background", "literature review",
+    "revision history", "appendix", "glossary", "index"
+])
+
+SHORT_NUMBER_RE = re.compile(r'^\d+\.?$')
+SINGLE_LETTER_RE = re.compile(r'^[A-Za-z]$')
+WHITESPACE_RE = re.compile(r'\s+')
+NUMBERED_HEADING_RE = re.compile(
+    r'^(?:'
+    r'\d+\.\s+.+'             # "1. Introduction"
+    r'|\d+\.\d+\s+.+'         # "2.1 Section"
+    r'|\d+\.\d+\.\d+\s+.+'    # "2.1.1 Subsection"
+    r'|Chapter\s+\d+.*'       # "Chapter 1"
+    r'|Section\s+\d+.*'       # "Section 1"
+    r'|Part\s+\d+.*'          # "Part 1"
+    r')',
+    re.IGNORECASE,
+)
+# Whitespace-free form of every line NUMBERED_HEADING_RE accepts, for the page prefilter
+PREFILTER_RE = re.compile(r'^(?:\d+\..|Chapter\d|Section\d|Part\d)', re.IGNORECASE)
+COMMON_HEADING_KEYS = frozenset(WHITESPACE_RE.sub('', h) for h in COMMON_HEADINGS)
+# Lowercased first letters those lines can start with ("ſ" case-folds to "s" under IGNORECASE)
+PREFILTER_FIRST_CHARS = frozenset("cspſ") | frozenset(h[0] for h in COMMON_HEADING_KEYS)
+# Level patterns are tried in this order, first match wins
+HEADING_LEVEL_RES = (
+    (re.compile(r'^\d+\.\s+'), "H1"),
+    (re.compile(r'^\d+\.\d+\s+'), "H2"),
+    (re.compile(r'^\d+\.\d+\.\d+\s+'), "H3"),
+)
+
 def is_form_document(title, all_text_elements):
-    form_keywords = ["form", "application", "request", "certificate", "registration", "claim", "report", "invoice"]
     title_lower = title.lower()
-    if any(word in title_lower for word in form_keywords):
+    if any(word in title_lower for word in FORM_KEYWORDS):
         return True
-    first_page_elems = [e for e in all_text_elements if e["page"] == 1]
-    short_numbered = [e for e in first_page_elems if re.match(r'^\d+\.?$', e["text"].strip())]
+    first_page_elems = [e for e in all_text_elements if e.page == 1]
+    short_numbered = [e for e in first_page_elems if SHORT_NUMBER_RE.match(e.text.strip())]
     if len(short_numbered) >= 5:
         return True
-    table_fields = [
-        "date", "name", "age", "s.no", "relationship", "signature", "remarks", "version", "identifier", "reference", "pay + si + npa"
-    ]
-    table_fields_found = [e for e in first_page_elems if e["text"].strip().lower() in table_fields]
+    table_fields_found = [e for e in first_page_elems if e.text.strip().lower() in TABLE_FIELDS]
     if len(table_fields_found) >= 3:
         return True
     return False
 
+def classify_heading(text):
+    # Single pass over a line: returns (confidence, level) for a heading candidate, None otherwise.
+    # level is None for candidates such as "Chapter 1" that have no H1-H3 mapping.
+    stripped = text.strip()
+    if len(stripped) > 200:
+        return None
+    if SHORT_NUMBER_RE.match(stripped) or SINGLE_LETTER_RE.match(stripped):
+        return None
+    lowered = stripped.lower()
+    if lowered in TABLE_FIELDS:
+        return None
+    # Only include numbered headings if they are not too long (avoid list items)
+    if len(stripped) <= 80 and NUMBERED_HEADING_RE.match(stripped):
+        return 10, numbered_heading_level(stripped)
+    if lowered in COMMON_HEADINGS:
+        return 10, "H1"
+    return None
+
+def numbered_heading_level(stripped):
+    for pattern, level in HEADING_LEVEL_RES:
+        if pattern.match(stripped):
+            return level
+    return None
+
 def is_numbered_heading(text):
-    patterns = [
-        r'^\d+\.\s+.+',           # "1. Introduction"
-        r'^\d+\.\d+\s+.+',        # "2.1 Section"
-        r'^\d+\.\d+\.\d+\s+.+',   # "2.1.1 Subsection"
-        r'^Chapter\s+\d+.*',      # "Chapter 1"
-        r'^Section\s+\d+.*',      # "Section 1"
-        r'^Part\s+\d+.*',         # "Part 1"
-    ]
-    for pattern in patterns:
-        if re.match(pattern, text.strip(), re.IGNORECASE):
-            return True
-    return False
+    return NUMBERED_HEADING_RE.match(text.strip()) is not None
 
 def is_exact_common_heading(text, match=None):
-    common_headings = [
-        "introduction", "overview", "conclusion", "summary", "references", 
-        "bibliography", "acknowledgements", "table of contents", "abstract",
-        "methodology", "results", "discussion", "background", "literature review",
-        "revision history", "appendix", "glossary", "index"
-    ]
     text_lower = text.lower().strip()
     if match:
         return text_lower == match
-    return text_lower in common_headings
+    return text_lower in COMMON_HEADINGS
 
 def is_table_or_form_label(text):
-    if re.match(r'^\d+\.?$', text.strip()):
+    stripped = text.strip()
+    if SHORT_NUMBER_RE.match(stripped):
         return True
-    if re.match(r'^[A-Za-z]$', text.strip()):
+    if SINGLE_LETTER_RE.match(stripped):
         return True
-    table_fields = [
-        "date", "name", "age", "s.no", "relationship", "signature", "remarks", "version", "identifier", "reference", "pay + si + npa"
-    ]
-    text_lower = text.lower().strip()
-    return text_lower in table_fields
+    return stripped.lower() in TABLE_FIELDS
 
 def determine_heading_level(text):
-    if re.match(r'^\d+\.\s+', text.strip()):
-        return "H1"
-    elif re.match(r'^\d+\.\d+\s+', text.strip()):
-        return "H2"
-    elif re.match(r'^\d+\.\d+\.\d+\s+', text.strip()):
-        return "H3"
+    level = numbered_heading_level(text.strip())
+    if level:
+        return level
     if is_exact_common_heading(text):
         return "H1"
     return None
 
-def remove_duplicate_headings(candidates):
-    unique_candidates = []
-    seen_texts = set()
-    for candidate in candidates:
-        text_normalized = re.sub(r'\s+', ' ', candidate["text"].lower().strip())
-        if text_normalized not in seen_texts:
-            seen_texts.add(text_normalized)
-            unique_candidates.append(candidate)
-    return unique_candidates
+def heading_key(text):
+    return WHITESPACE_RE.sub(' ', text.lower().strip())
+
+def title_keys(title_lines):
+    return frozenset(WHITESPACE_RE.sub(' ', t) for t in title_lines)
 
 def remove_title_headings(outline, title):
     # Remove any heading that matches any line in the title (case-insensitive, ignoring whitespace)
-    title_lines = [t.strip().lower() for t in split_title_lines(title)]
-    def is_title_line(htext):
-        htext_norm = re.sub(r'\s+', ' ', htext.strip().lower())
-        return any(htext_norm == re.sub(r'\s+', ' ', t) for t in title_lines)
-    return [h for h in outline if not is_title_line(h["text"])]
+    return remove_title_from_headings(outline, [t.strip().lower() for t in split_title_lines(title)])
 
 def remove_title_from_headings(heading_candidates, title_lines):
     # Remove any heading candidate that matches any line in the title
-    def is_title_line(htext):
-        htext_norm = re.sub(r'\s+', ' ', htext.strip().lower())
-        return any(htext_norm == re.sub(r'\s+', ' ', t) for t in title_lines)
-    return [h for h in heading_candidates if not is_title_line(h["text"])]
+    keys = title_keys(title_lines)
+    return [h for h in heading_candidates if heading_key(h["text"]) not in keys]
 
 def normalize_heading_text(h):
     h["text"] = re.sub(r' +', ' ', h["text"])
@@ -240,11 +446,137 @@ def normalize_heading_text(h):
     h["text"] = h["text"].rstrip() + " "  # Ensure trailing space as in expected output
     return h
 
+import argparse
 import os
 import json
-from process_pdfs import extract_outline
-
-def main():
+import time
+from process_pdfs import EXTRACTOR_VERSION, run_extraction
+from result_cache import ResultCache
+from worker_pool import WorkerPool, STATUS_OK
+
+def write_outline(data, filename, output_dir):
+    if not data:
+        data = {"title": "Untitled Document", "outline": []}
+    out_filename = os.path.splitext(filename)[0] + ".json"
+    out_path = os.path.join(output_dir, out_filename)
+    # Write next to the target and rename, so readers never see a partial file
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, out_path)
+
+def write_metrics(metrics_file, filename, status, metrics=None, write_seconds=None):
+    # One JSON record per file, appended as soon as the file is done
+    record = {"file": filename, "status": status}
+    if metrics:
+        record.update(metrics)
+    if write_seconds is not None:
+        record["write_json_seconds"] = round(write_seconds, 6)
+    metrics_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    metrics_file.flush()
+
+def profile_path_for(filename, profile, output_dir):
+    # --profile names one input file; its reports land next to its JSON output
+    if not profile or filename != profile:
+        return None
+    return os.path.join(output_dir, os.path.splitext(filename)[0])
+
+def process_serial(pdf_files, input_dir, output_dir, prefilter=False, cache=None, metrics_file=None, profile=None,
+                   shards=1, jsonl=None, model_cache=None):
+    ok = hits = 0
+    write = jsonl.write_outline if jsonl is not None else write_outline
+    for filename in pdf_files:
+        try:
+            pdf_path = os.path.join(input_dir, filename)
+            if not os.path.exists(pdf_path):
+                continue
+            data, cache_hit, metrics = run_extraction(pdf_path, prefilter, cache, metrics_file is not None,
+                                                      profile_path_for(filename, profile, output_dir), shards,
+                                                      model_cache)
+            write_start = time.perf_counter()
+            write(data, filename, output_dir)
+            if metrics_file is not None:
+                write_metrics(metrics_file, filename, STATUS_OK, metrics, time.perf_counter() - write_start)
+            ok += 1
+            hits += cache_hit
+        except Exception as e:
+            print(f"Error processing {filename}: {str(e)}")
+            if jsonl is not None:
+                jsonl.write_error(filename, "error", e)
+            if metrics_file is not None:
+                write_metrics(metrics_file, filename, "error")
+    return ok, hits
+
+def process_batch(pdf_files, input_dir, output_dir, workers=None, timeout=None, prefilter=False, cache=None,
+                  metrics_file=None, profile=None, jsonl=None, model_cache=None):
+    # Each file runs in its own pool task, so a hang or crash only loses that file
+    ok = hits = 0
+    write = jsonl.write_outline if jsonl is not None else write_outline
+    tasks = [(filename, os.path.join(input_dir, filename), prefilter, cache, metrics_file is not None,
+              profile_path_for(filename, profile, output_dir), 1, model_cache) for filename in pdf_files]
+    with WorkerPool(run_extraction, workers=workers, timeout=timeout) as pool:
+        for filename, status, payload, elapsed in pool.run(tasks):
+            if status != STATUS_OK:
+                print(f"Error processing {filename} ({status}): {payload}")
+                if jsonl is not None:
+                    jsonl.write_error(filename, status, payload)
+                if metrics_file is not None:
+                    write_metrics(metrics_file, filename, status, {"wall_seconds": round(elapsed, 6)})
+                continue
+            data, cache_hit, metrics = payload
+            try:
+                write_start = time.perf_counter()
+                write(data, filename, output_dir)
+                if metrics_file is not None:
+                    metrics["wall_seconds"] = round(elapsed, 6)
+                    write_metrics(metrics_file, filename, status, metrics, time.perf_counter() - write_start)
+                ok += 1
+                hits += cache_hit
+            except Exception as e:
+                print(f"Error writing {filename}: {str(e)}")
+    return ok, hits
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract title and H1-H3 outline from PDFs")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for batch mode (0 = one per CPU core)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="per-file wall-clock limit in seconds (batch mode)")
+    parser.add_argument("--prefilter", action="store_true",
+                        help="skip span extraction on pages whose plain text cannot hold a heading")
+    parser.add_argument("--cache-dir", default=None,
+                        help="reuse outlines of unchanged PDFs from this content-addressed cache")
+    parser.add_argument("--cache-max-mb", type=float, default=512,
+                        help="size bound of the result cache before LRU eviction")
+    parser.add_argument("--model-cache", default=None,
+                        help="build the shared document model (all lines plus outline) and store it in this "
+                             "directory for the persona pipeline; ignores --prefilter and --shards")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="split long PDFs into page ranges extracted by this many processes (serial mode)")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and process PDFs as they appear or change in the input directory")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="seconds between input directory scans in watch mode")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="files handed to the pool at once in watch mode (default: 2 x workers)")
+    parser.add_argument("--output-format", choices=["files", "jsonl"], default="files",
+                        help="one pretty-printed JSON per PDF (default) or all results appended to one JSONL")
+    parser.add_argument("--jsonl-max-mb", type=float, default=0,
+                        help="rotate the JSONL output into shards of about this size (0 = a single file)")
+    parser.add_argument("--metrics", default=None,
+                        help="append per-file stage timings and counters to this JSONL file")
+    parser.add_argument("--profile", default=None,
+                        help="run cProfile and tracemalloc on this input file; reports go to the output directory")
+    parser.add_argument("--input-dir", default=None, help="override the input directory")
+    parser.add_argument("--output-dir", default=None, help="override the output directory")
+    args = parser.parse_args(argv)
+    if args.shards > 1 and (args.watch or args.workers != 1 or args.timeout is not None):
+        # Pool workers are daemonic and cannot start shard processes of their own
+        parser.error("--shards only applies to serial batch mode (--workers 1, no --timeout, no --watch)")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
     is_docker = os.path.exists("/.dockerenv")
     if is_docker:
         INPUT_DIR = "/app/input"
@@ -252,6 +584,8 @@ def main():
     else:
         INPUT_DIR = os.path.join(os.getcwd(), "sample_dataset/pdfs")
         OUTPUT_DIR = os.path.join(os.getcwd(), "sample_dataset/outputs")
+    INPUT_DIR = args.input_dir or INPUT_DIR
+    OUTPUT_DIR = args.output_dir or OUTPUT_DIR
 
     if not os.path.exists(INPUT_DIR):
         print(f"Input directory {INPUT_DIR} does not exist!")
@@ -260,9 +594,35 @@ def main():
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
 
+    cache = None
+    if args.cache_dir:
+        cache = ResultCache(args.cache_dir, EXTRACTOR_VERSION, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+
+    model_cache = None
+    if args.model_cache:
+        from document_model import MODEL_VERSION
+        model_cache = ResultCache(args.model_cache, MODEL_VERSION, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+
+    jsonl = None
+    if args.output_format == "jsonl":
+        from jsonl_output import JsonlWriter
+        jsonl = JsonlWriter(OUTPUT_DIR, max_bytes=int(args.jsonl_max_mb * 1024 * 1024) or None)
+
+    if args.watch:
+        from watch import DirectoryWatcher
+        workers = args.workers if args.workers > 0 else os.cpu_count()
+        try:
+            DirectoryWatcher(INPUT_DIR, OUTPUT_DIR, write_outline, workers=workers, timeout=args.timeout,
+                             prefilter=args.prefilter, cache=cache, poll_interval=args.poll_interval,
+                             max_pending=args.max_pending, jsonl=jsonl, model_cache=model_cache).run()
+        finally:
+            if jsonl is not None:
+                jsonl.close()
+        return
+
     try:
         all_files = os.listdir(INPUT_DIR)
-        pdf_files = [f for f in all_files if f.lower().endswith(".pdf")]
+        pdf_files = sorted(f for f in all_files if f.lower().endswith(".pdf"))
     except Exception as e:
         print(f"Error reading input directory: {e}")
         return
@@ -271,20 +631,31 @@ def main():
         print(f"No PDF files found in {INPUT_DIR}")
         return
 
-    for filename in pdf_files:
-        try:
-            pdf_path = os.path.join(INPUT_DIR, filename)
-            if not os.path.exists(pdf_path):
-                continue
-            data = extract_outline(pdf_path)
-            if not data:
-                data = {"title": "Untitled Document", "outline": []}
-            out_filename = os.path.splitext(filename)[0] + ".json"
-            out_path = os.path.join(OUTPUT_DIR, out_filename)
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            print(f"Error processing {filename}: {str(e)}")
+    metrics_file = open(args.metrics, "a", encoding="utf-8") if args.metrics else None
+    start = time.perf_counter()
+    try:
+        if args.workers == 1 and args.timeout is None:
+            ok, hits = process_serial(pdf_files, INPUT_DIR, OUTPUT_DIR, prefilter=args.prefilter, cache=cache,
+                                      metrics_file=metrics_file, profile=args.profile, shards=args.shards,
+                                      jsonl=jsonl, model_cache=model_cache)
+        else:
+            workers = args.workers if args.workers > 0 else os.cpu_count()
+            ok, hits = process_batch(pdf_files, INPUT_DIR, OUTPUT_DIR, workers=workers, timeout=args.timeout,
+                                     prefilter=args.prefilter, cache=cache,
+                                     metrics_file=metrics_file, profile=args.profile, jsonl=jsonl,
+                                     model_cache=model_cache)
+    finally:
+        if metrics_file is not None:
+            metrics_file.close()
+        if jsonl is not None:
+            jsonl.close()
+    elapsed = time.perf_counter() - start
+    rate = len(pdf_files) / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {ok}/{len(pdf_files)} files in {elapsed:.2f}s ({rate:.2f} files/sec)")
+    if cache is not None or model_cache is not None:
+        hit_rate = hits / ok if ok else 0.0
+        label = "Result cache" if cache is not None else "Model cache"
+        print(f"{label}: {hits} hits, {ok - hits} misses ({hit_rate:.0%} hit rate)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction still works, just without the cross-process lock
+    fcntl = None
+
+CHUNK_SIZE = 1 << 20
+# Other processes write to the same directory, so the running size estimate is refreshed this often
+SIZE_RESCAN_SECONDS = 60.0
+
+# One ResultCache per process and (directory, version, size bound); see ResultCache.__reduce__
+_shared = {}
+
+
+def hash_pdf(pdf_path, version):
+    digest = hashlib.sha256(version.encode("utf-8") + b"\0")
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """On-disk outline cache keyed by a hash of the PDF bytes and extractor version.
+
+    Entries are written with an atomic rename, so several processes can share
+    one directory. Reads refresh the entry mtime, and once the directory
+    grows past ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir, version, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.version = version
+        self.max_bytes = max_bytes
+        self._size = None
+        self._scanned_at = 0.0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def __reduce__(self):
+        # Caches travel to pool workers inside every task; unpickling returns the worker's own
+        # instance, so its size estimate survives across tasks instead of a directory scan per miss
+        return (shared_cache, (self.cache_dir, self.version, self.max_bytes))
+
+    def key_for(self, pdf_path):
+        return hash_pdf(pdf_path, self.version)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        if self._size is None or time.monotonic() - self._scanned_at > SIZE_RESCAN_SECONDS:
+            self._size = self._scan_size()
+            self._scanned_at = time.monotonic()
+        else:
+            self._size += size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target_ratio=0.9):
+        lock_path = os.path.join(self.cache_dir, ".evict.lock")
+        with open(lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * target_ratio
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+            self._size = total
+            self._scanned_at = time.monotonic()
+
+
+def shared_cache(cache_dir, version, max_bytes=512 * 1024 * 1024):
+    key = (os.path.abspath(cache_dir), version, max_bytes)
+    cache = _shared.get(key)
+    if cache is None:
+        cache = _shared[key] = ResultCache(cache_dir, version, max_bytes)
+    return cache
@@ -0,0 +1,236 @@
+import argparse
+import itertools
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import wait
+
+from process_pdfs import extract_outline_from_bytes
+from worker_pool import WorkerPool, STATUS_OK, STATUS_TIMEOUT
+
+LATENCY_WINDOW = 1000
+MAX_BODY_BYTES = 200 * 1024 * 1024
+
+
+class QueueFull(Exception):
+    pass
+
+
+class ExtractionFailed(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return round(sorted_values[index], 1)
+
+
+class OutlineService:
+    """Feeds PDF bytes from request threads to a pre-forked pool of warm workers.
+
+    One dispatcher thread owns the WorkerPool. Request threads hand over work
+    through a queue and a wake-up socket and block on a Future for the result.
+    """
+
+    def __init__(self, workers=None, timeout=None, max_queue=64, prefilter=False):
+        self.pool = WorkerPool(extract_outline_from_bytes, workers=workers, timeout=timeout)
+        self.max_queue = max_queue
+        self.prefilter = prefilter
+        self._requests = queue.Queue()
+        self._futures = {}
+        self._ids = itertools.count()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counts = {"requests": 0, "ok": 0, "errors": 0, "rejected": 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._dispatch_loop, name="outline-dispatcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self):
+        return self._requests.qsize() + self.pool.queued
+
+    def submit(self, pdf_bytes):
+        with self._lock:
+            self._counts["requests"] += 1
+            if self.queue_depth >= self.max_queue:
+                self._counts["rejected"] += 1
+                raise QueueFull(f"queue depth {self.queue_depth} reached the limit of {self.max_queue}")
+        future = Future()
+        self._requests.put((next(self._ids), pdf_bytes, future, time.perf_counter()))
+        self._wake_w.send(b"\0")
+        return future
+
+    def metrics(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self._counts)
+        queued = self.queue_depth
+        return dict(
+            counts,
+            workers=self.pool.workers,
+            queue_depth=queued,
+            busy_workers=max(0, self.pool.in_flight - self.pool.queued),
+            latency_ms={
+                "window": len(latencies),
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "p99": percentile(latencies, 99),
+                "max": round(latencies[-1], 1) if latencies else None,
+            },
+        )
+
+    def close(self):
+        self._closed = True
+        self._wake_w.send(b"\0")
+        self._thread.join()
+        self.pool.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+    def _drain_wakeups(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _dispatch_loop(self):
+        while not self._closed or self.pool.in_flight:
+            while True:
+                try:
+                    request_id, pdf_bytes, future, started = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                self._futures[request_id] = (future, started)
+                self.pool.submit(request_id, pdf_bytes, self.prefilter)
+            if self.pool.in_flight:
+                results = self.pool.poll(None, wakeup=[self._wake_r])
+            else:
+                wait([self._wake_r])
+                results = []
+            self._drain_wakeups()
+            for request_id, status, payload, _ in results:
+                self._resolve(request_id, status, payload)
+
+    def _resolve(self, request_id, status, payload):
+        future, started = self._futures.pop(request_id)
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._latencies.append(latency_ms)
+            self._counts["ok" if status == STATUS_OK else "errors"] += 1
+        if status == STATUS_OK:
+            future.set_result(payload)
+        else:
+            future.set_exception(ExtractionFailed(status, payload))
+
+
+class OutlineRequestHandler(BaseHTTPRequestHandler):
+    server_version = "OutlineService/1"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send_json(200, self.server.service.metrics())
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/outline":
+            self._send_json(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._send_json(400, {"error": "expected a PDF body with Content-Length"})
+            return
+        pdf_bytes = self.rfile.read(length)
+        try:
+            data = self.server.service.submit(pdf_bytes).result()
+        except QueueFull as e:
+            self._send_json(503, {"error": str(e)})
+            return
+        except ExtractionFailed as e:
+            code = 504 if e.status == STATUS_TIMEOUT else 422
+            self._send_json(code, {"error": str(e), "status": e.status})
+            return
+        self._send_json(200, data)
+
+    def _send_json(self, code, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        # Unix socket peers have no host/port; BaseHTTPRequestHandler expects one
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+
+def make_server(service, host="127.0.0.1", port=8080, unix_socket=None):
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = UnixHTTPServer(unix_socket, OutlineRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), OutlineRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve PDF outline extraction over local HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix-socket", default=None, help="listen on this unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 = one per CPU core)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request extraction limit in seconds")
+    parser.add_argument("--max-queue", type=int, default=64, help="queued requests before answering 503")
+    parser.add_argument("--prefilter", action="store_true",
+                        help="skip span extraction on pages whose plain text cannot hold a heading")
+    args = parser.parse_args(argv)
+
+    service = OutlineService(workers=args.workers or os.cpu_count(), timeout=args.timeout,
+                             max_queue=args.max_queue, prefilter=args.prefilter)
+    server = make_server(service, args.host, args.port, args.unix_socket)
+    where = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"Serving outlines on {where} with {service.pool.workers} worker(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.remove(args.unix_socket)
+
+
+if __name__ == "__main__":
+    main()
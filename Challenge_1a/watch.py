@@ -0,0 +1,116 @@
+import os
+import signal
+import time
+from collections import OrderedDict
+
+from process_pdfs import run_extraction
+from worker_pool import WorkerPool, STATUS_OK
+
+
+def scan_pdfs(input_dir):
+    signatures = {}
+    try:
+        with os.scandir(input_dir) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(".pdf"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if entry.is_file():
+                    signatures[entry.name] = (st.st_mtime_ns, st.st_size)
+    except OSError as e:
+        print(f"Error reading input directory: {e}")
+    return signatures
+
+
+class DirectoryWatcher:
+    """Keeps a warm worker pool and feeds it PDFs as they land in ``input_dir``.
+
+    A file is picked up once its size and mtime are unchanged across two scans,
+    so half-copied files are not parsed. At most ``max_pending`` files are
+    handed to the pool at a time; the rest wait in arrival order.
+    """
+
+    def __init__(self, input_dir, output_dir, write_outline, workers=1, timeout=None,
+                 prefilter=False, cache=None, poll_interval=1.0, max_pending=None, jsonl=None, model_cache=None):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.write_outline = jsonl.write_outline if jsonl is not None else write_outline
+        self.jsonl = jsonl
+        self.workers = workers
+        self.timeout = timeout
+        self.prefilter = prefilter
+        self.cache = cache
+        self.model_cache = model_cache
+        self.poll_interval = poll_interval
+        self.max_pending = max_pending or 2 * workers
+        self.processed = {}
+        self.last_seen = {}
+        self.ready = OrderedDict()
+        self.stopping = False
+
+    def stop(self, *_):
+        self.stopping = True
+
+    def scan(self):
+        current = scan_pdfs(self.input_dir)
+        for name, signature in current.items():
+            stable = self.last_seen.get(name) == signature
+            if stable and self.processed.get(name) != signature and name not in self.ready:
+                self.ready[name] = signature
+        for name in list(self.processed):
+            if name not in current:
+                del self.processed[name]
+        self.last_seen = current
+
+    def submit_ready(self, pool):
+        while self.ready and pool.in_flight < self.max_pending:
+            name, signature = self.ready.popitem(last=False)
+            self.processed[name] = signature
+            pool.submit(name, os.path.join(self.input_dir, name), self.prefilter, self.cache, False, None, 1,
+                        self.model_cache)
+
+    def handle(self, name, status, payload, elapsed):
+        if status != STATUS_OK:
+            print(f"Error processing {name} ({status}): {payload}")
+            if self.jsonl is not None:
+                self.jsonl.write_error(name, status, payload)
+            return
+        data, cache_hit, _ = payload
+        try:
+            self.write_outline(data, name, self.output_dir)
+        except Exception as e:
+            print(f"Error writing {name}: {str(e)}")
+            return
+        source = "cache" if cache_hit else f"{elapsed * 1000:.0f} ms"
+        print(f"Processed {name} ({source})")
+
+    def run(self):
+        previous = {sig: signal.signal(sig, self.stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+        print(f"Watching {self.input_dir} with {self.workers} worker(s)")
+        try:
+            with WorkerPool(run_extraction, workers=self.workers, timeout=self.timeout) as pool:
+                next_scan = 0.0
+                while not self.stopping or pool.in_flight:
+                    now = time.monotonic()
+                    if not self.stopping and now >= next_scan:
+                        self.scan()
+                        next_scan = now + self.poll_interval
+                    if not self.stopping:
+                        self.submit_ready(pool)
+                    wait_for = self.poll_interval if self.stopping else max(0.0, next_scan - time.monotonic())
+                    if pool.in_flight:
+                        results = pool.poll(wait_for)
+                        for result in results:
+                            self.handle(*result)
+                        if results and self.jsonl is not None:
+                            # Each poll round is a batch boundary for the JSONL output
+                            self.jsonl.sync()
+                    else:
+                        time.sleep(wait_for)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+        print("Watcher stopped")
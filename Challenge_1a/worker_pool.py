@@ -0,0 +1,188 @@
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_CRASHED = "crashed"
+
+
+def _get_context():
+    # fork keeps PyMuPDF and everything else the parent imported warm in the workers
+    if "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork")
+    return mp.get_context("spawn")
+
+
+def _worker_main(func, conn):
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        key, args = task
+        try:
+            result = (key, STATUS_OK, func(*args))
+            conn.send(result)
+        except Exception as e:
+            conn.send((key, STATUS_ERROR, str(e)))
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx, func):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(func, child_conn), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.key = None
+        self.started = None
+
+    def assign(self, key, args):
+        self.key = key
+        self.started = time.monotonic()
+        self.conn.send((key, args))
+
+    def release(self):
+        key, elapsed = self.key, time.monotonic() - self.started
+        self.key = None
+        self.started = None
+        return key, elapsed
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """Fixed-size pool of long-lived worker processes.
+
+    Each task is sent to exactly one worker, so a task that overruns ``timeout``
+    or takes its worker down only fails that task; the worker is replaced and
+    the rest of the queue keeps flowing.
+    """
+
+    def __init__(self, func, workers=None, timeout=None):
+        self.func = func
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.timeout = timeout
+        self._ctx = _get_context()
+        self._queue = deque()
+        self._idle = [_Worker(self._ctx, func) for _ in range(self.workers)]
+        self._busy = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def queued(self):
+        return len(self._queue)
+
+    @property
+    def in_flight(self):
+        return len(self._queue) + len(self._busy)
+
+    def submit(self, key, *args):
+        self._queue.append((key, args))
+
+    def poll(self, timeout=None, wakeup=()):
+        """Wait up to ``timeout`` seconds and return finished tasks.
+
+        Results are ``(key, status, payload, elapsed)`` tuples where ``payload``
+        is the function result for ``ok`` and an error message otherwise.
+        ``wakeup`` holds extra waitable objects that end the wait early.
+        """
+        self._dispatch()
+        if not self._busy:
+            return []
+
+        wait_for = timeout
+        if self.timeout is not None:
+            now = time.monotonic()
+            next_deadline = min(w.started + self.timeout for w in self._busy) - now
+            wait_for = max(0.0, next_deadline) if wait_for is None else min(wait_for, max(0.0, next_deadline))
+
+        handles = {}
+        for worker in self._busy:
+            handles[worker.conn] = worker
+            handles[worker.process.sentinel] = worker
+        ready = [h for h in wait(list(handles) + list(wakeup), wait_for) if h in handles]
+
+        results = []
+        done = set()
+        for handle in ready:
+            worker = handles[handle]
+            if worker in done:
+                continue
+            done.add(worker)
+            results.append(self._collect(worker))
+
+        if self.timeout is not None:
+            now = time.monotonic()
+            for worker in self._busy:
+                if worker not in done and now - worker.started > self.timeout:
+                    done.add(worker)
+                    key, elapsed = worker.release()
+                    self._replace(worker)
+                    results.append((key, STATUS_TIMEOUT, f"timed out after {self.timeout}s", elapsed))
+
+        self._busy = [w for w in self._busy if w not in done]
+        self._dispatch()
+        return results
+
+    def run(self, tasks):
+        """Submit ``(key, *args)`` tuples and yield results as they complete."""
+        for task in tasks:
+            self.submit(*task)
+        while self.in_flight:
+            for result in self.poll():
+                yield result
+
+    def close(self):
+        for worker in self._idle + self._busy:
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        for worker in self._idle + self._busy:
+            worker.process.join(1)
+            worker.kill()
+        self._idle = []
+        self._busy = []
+        self._queue.clear()
+
+    def _collect(self, worker):
+        try:
+            if worker.conn.poll():
+                key, status, payload = worker.conn.recv()
+                _, elapsed = worker.release()
+                self._idle.append(worker)
+                return key, status, payload, elapsed
+        except (EOFError, OSError):
+            pass
+        key, elapsed = worker.release()
+        worker.process.join(1)
+        exitcode = worker.process.exitcode
+        self._replace(worker)
+        return key, STATUS_CRASHED, f"worker exited with code {exitcode}", elapsed
+
+    def _replace(self, worker):
+        worker.kill()
+        self._idle.append(_Worker(self._ctx, self.func))
+
+    def _dispatch(self):
+        while self._queue and self._idle:
+            key, args = self._queue.popleft()
+            worker = self._idle.pop()
+            worker.assign(key, args)
+            self._busy.append(worker)
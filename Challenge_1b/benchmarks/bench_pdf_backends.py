@@ -0,0 +1,109 @@
+"""Compare PDF text-extraction backends on the sample collections.
+
+Each backend runs in a fresh interpreter so its peak RSS is its own. Reports
+pages/sec and memory per backend, and fails if the backends disagree on which
+pages carry text.
+
+    python benchmarks/bench_pdf_backends.py
+    python benchmarks/bench_pdf_backends.py --backends pymupdf pypdf2 --repeat 5
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+
+DEFAULT_COLLECTIONS = os.path.join(ROOT_DIR, "Challenge_1b")
+
+
+def peak_rss_mb():
+    # VmHWM belongs to this exec'd image; ru_maxrss on Linux also carries the parent's peak over fork/exec
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def find_pdfs(collections_dir):
+    return sorted(glob.glob(os.path.join(collections_dir, "*", "PDFs", "*.pdf")))
+
+
+def run_backend(name, pdf_paths, repeat):
+    # Runs inside the child interpreter
+    from pdf_backends import get_backend
+
+    backend = get_backend(name)
+    times = []
+    pages = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages = {path: sorted(backend.extract_page_texts(path)) for path in pdf_paths}
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    for path in pdf_paths:
+        backend.extract_page_texts(path)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": min(times),
+        "text_pages": sum(len(numbers) for numbers in pages.values()),
+        "pages": pages,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "python_peak_mb": round(python_peak / (1024 * 1024), 2),
+    }
+
+
+def measure(name, collections_dir, repeat):
+    cmd = [sys.executable, "-W", "ignore", os.path.abspath(__file__), "--child", name,
+           "--collections", collections_dir, "--repeat", str(repeat)]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["model", "pymupdf", "pypdf2"])
+    parser.add_argument("--collections", default=DEFAULT_COLLECTIONS,
+                        help="directory holding Collection */PDFs")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per backend, the fastest is kept")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    pdf_paths = find_pdfs(args.collections)
+    if args.child:
+        print(json.dumps(run_backend(args.child, pdf_paths, args.repeat)))
+        return
+
+    print(f"{len(pdf_paths)} PDFs from {args.collections}")
+    print(f"{'backend':<10}{'seconds':>10}{'pages/s':>10}{'rss MB':>9}{'py MB':>8}")
+    results = {}
+    for name in args.backends:
+        case = measure(name, args.collections, args.repeat)
+        results[name] = case
+        rate = case["text_pages"] / case["seconds"] if case["seconds"] > 0 else 0.0
+        print(f"{name:<10}{case['seconds']:>10.3f}{rate:>10.0f}{case['peak_rss_mb']:>9.1f}{case['python_peak_mb']:>8.2f}")
+
+    reference_name = args.backends[0]
+    reference = results[reference_name]["pages"]
+    mismatched = [name for name in args.backends[1:] if results[name]["pages"] != reference]
+    if mismatched:
+        sys.exit(f"backends {mismatched} return different text pages than {reference_name}")
+
+
+if __name__ == "__main__":
+    main()
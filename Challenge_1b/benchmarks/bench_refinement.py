@@ -0,0 +1,83 @@
+"""Benchmark subsection refinement: leading sentences vs. query-focused selection.
+
+The sample collections are loaded once. Every persona/job query then ranks
+them with keyword ranking and refines the top sections three ways:
+
+- the old leading-sentence cut;
+- query-focused selection from a cold extractor;
+- query-focused selection again with the sentence indexes warm.
+
+Reported per mode are the mean latency per query and the share of the
+query's mapped keywords that appear in the refined texts.
+
+    python benchmarks/bench_refinement.py --repeat 20
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+
+from document_processor import DocumentProcessor  # noqa: E402
+from persona_analyzer import PersonaAnalyzer  # noqa: E402
+from section_extractor import SectionExtractor  # noqa: E402
+
+QUERIES = [
+    ("Travel Planner", "Plan a trip of 4 days for a group of 10 college friends."),
+    ("Travel Planner", "Find budget accommodation and nightlife for a week on the coast."),
+    ("HR professional", "Create and manage fillable forms for onboarding and compliance."),
+    ("HR professional", "Prepare documents for e-signatures and share them with new employees."),
+    ("Food Contractor", "Prepare a vegetarian buffet-style dinner menu for a corporate gathering"),
+    ("Food Contractor", "Plan a gluten-free lunch menu with side dishes for 50 guests"),
+]
+
+
+def coverage(subsection_analysis, matcher):
+    text = " ".join(item["refined_text"] for item in subsection_analysis).lower()
+    return sum(keyword in text for keyword in matcher.keywords) / max(matcher.total_keywords, 1)
+
+
+def run(extractor, analyzer, sections_data, repeat, query_focused):
+    seconds = 0.0
+    covered = 0.0
+    for _ in range(repeat):
+        for persona, job in QUERIES:
+            matcher = analyzer.build_matcher(persona, job)
+            ranked = analyzer.rank_sections(sections_data, persona, job)
+            query = analyzer.build_query(persona, job, matcher) if query_focused else None
+            start = time.perf_counter()
+            analysis = extractor.generate_subsection_analysis(ranked, query)
+            seconds += time.perf_counter() - start
+            covered += coverage(analysis, matcher)
+    runs = repeat * len(QUERIES)
+    return seconds / runs * 1000, covered / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(ROOT_DIR, "Challenge_1b", "Collection *", "PDFs", "*.pdf")))
+    sections_data = DocumentProcessor().process_documents(paths)
+    analyzer = PersonaAnalyzer(ranking="keyword")
+    print(f"{len(sections_data)} documents, {len(QUERIES)} queries x {args.repeat}")
+    print(f"{'refinement':<20}{'ms/query':>10}{'keyword coverage':>18}")
+
+    leading = SectionExtractor(refinement="leading")
+    cold = SectionExtractor(refinement="query")
+    rows = [
+        ("leading", run(leading, analyzer, sections_data, args.repeat, False)),
+        ("query (cold)", run(cold, analyzer, sections_data, 1, True)),
+        ("query (warm)", run(cold, analyzer, sections_data, args.repeat, True)),
+    ]
+    for name, (milliseconds, covered) in rows:
+        print(f"{name:<20}{milliseconds:>10.3f}{covered:>18.1%}")
+
+
+if __name__ == "__main__":
+    main()
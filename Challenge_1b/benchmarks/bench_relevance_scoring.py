@@ -0,0 +1,121 @@
+"""Benchmark PersonaAnalyzer.rank_sections against the per-section scoring it replaced.
+
+Synthetic sections mix persona/job keywords, words that embed them
+("processing", "formation", "studying") and filler. The legacy and current
+rankers must return identical scores and top-k.
+
+    python benchmarks/bench_relevance_scoring.py --sections 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from persona_analyzer import PersonaAnalyzer  # noqa: E402
+
+QUERIES = [
+    ("Travel Planner", "Plan a trip of 4 days for a group of 10 college friends."),
+    ("HR professional", "Create and manage fillable forms for onboarding and compliance."),
+    ("Food Contractor", "Prepare a vegetarian buffet-style dinner menu for a corporate gathering"),
+    ("PhD Researcher in Computational Biology", "Prepare a literature review on graph neural networks"),
+]
+FILLER = ("the a of and city coast village market museum beach wine local season guide page "
+          "tool option click select file share export edit sign pdf").split()
+EMBEDDING = ["processing", "formation", "studying", "planning", "recipes", "traveling",
+             "informal", "menus", "sourcesheet", "hotelier"]
+PUNCTUATION = ["", "", "", ":", " -", " 1.", " •"]
+
+
+def legacy_score(analyzer, section_content, persona, job_description):
+    persona_keywords = analyzer.extract_persona_keywords(persona)
+    job_keywords = analyzer.extract_job_keywords(job_description)
+    all_keywords = list(set(persona_keywords + job_keywords))
+    content_lower = section_content.lower()
+    keyword_matches = 0
+    for keyword in all_keywords:
+        if keyword in content_lower:
+            keyword_matches += 1
+    keyword_score = keyword_matches / max(len(all_keywords), 1)
+    length_score = min(len(section_content.split()) / 100, 1.0)
+    structure_score = 0.0
+    if any(marker in content_lower for marker in [':', '-', '•', '1.', '2.', '3.']):
+        structure_score = 0.3
+    final_score = (keyword_score * 0.6) + (length_score * 0.2) + (structure_score * 0.2)
+    return min(final_score, 1.0)
+
+
+def legacy_rank(analyzer, sections_data, persona, job_description):
+    all_sections = []
+    for document, doc_data in sections_data.items():
+        for page_num, sections in doc_data['sections'].items():
+            for section in sections:
+                all_sections.append({
+                    'document': document,
+                    'section_title': section['title'],
+                    'content': section['content'],
+                    'page_number': page_num,
+                    'relevance_score': legacy_score(analyzer, section['content'], persona, job_description),
+                    'word_count': section['word_count']
+                })
+    all_sections.sort(key=lambda x: x['relevance_score'], reverse=True)
+    for i, section in enumerate(all_sections, 1):
+        section['importance_rank'] = i
+    return all_sections[:10]
+
+
+def make_sections_data(count, seed, sections_per_page=5, pages_per_doc=20):
+    rng = random.Random(seed)
+    analyzer = PersonaAnalyzer(ranking='keyword')
+    keywords = sorted({k for persona, job in QUERIES
+                       for k in analyzer.extract_persona_keywords(persona) + analyzer.extract_job_keywords(job)})
+    vocabulary = FILLER * 4 + keywords + EMBEDDING
+    sections_data = {}
+    for n in range(count):
+        document = f"doc{n // (sections_per_page * pages_per_doc):05d}.pdf"
+        page_num = n // sections_per_page % pages_per_doc + 1
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(8, 160))]
+        content = " ".join(words).capitalize() + rng.choice(PUNCTUATION) + "."
+        pages = sections_data.setdefault(document, {'sections': {}})['sections']
+        pages.setdefault(page_num, []).append({
+            'title': " ".join(words[:10]) + "...",
+            'content': content,
+            'word_count': len(content.split()),
+        })
+    return sections_data
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sections_data = make_sections_data(args.sections, args.seed)
+    analyzer = PersonaAnalyzer(ranking='keyword')
+    print(f"{args.sections} sections")
+    print(f"{'persona':<40}{'legacy s':>10}{'current s':>11}{'speedup':>9}")
+    mismatches = []
+    for persona, job in QUERIES:
+        legacy_seconds, expected = timed(legacy_rank, analyzer, sections_data, persona, job)
+        current_seconds, result = timed(analyzer.rank_sections, sections_data, persona, job)
+        flag = "" if result == expected else "  MISMATCH"
+        if flag:
+            mismatches.append(persona)
+        print(f"{persona[:39]:<40}{legacy_seconds:>10.3f}{current_seconds:>11.3f}"
+              f"{legacy_seconds / current_seconds:>8.1f}x{flag}")
+    if mismatches:
+        sys.exit(f"rankings differ for {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark cold start of the 1b pipeline per runtime profile.
+
+Each run is a fresh interpreter that imports main, builds
+PersonaDocumentIntelligence and stops before the first document is
+processed. It reports the time taken, RSS and which heavy libraries got
+loaded. The "minimal" profile blocks scikit-learn outright, so an
+accidental eager import fails the run instead of going unnoticed.
+
+    python benchmarks/bench_startup.py --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(BENCH_DIR), "src")
+HEAVY_MODULES = ("fitz", "PyPDF2", "numpy", "scipy", "sklearn")
+
+# ranking, whether scikit-learn may be imported, whether to load the TF-IDF stack up front
+PROFILES = {
+    "minimal": ("keyword", False, False),
+    "hybrid": ("hybrid", True, False),
+    "eager": ("hybrid", True, True),
+}
+
+CHILD = r"""
+import json, sys, time
+started = time.perf_counter()
+if not {allow_sklearn}:
+    sys.modules["sklearn"] = None
+sys.path.insert(0, {src!r})
+from main import PersonaDocumentIntelligence
+pdi = PersonaDocumentIntelligence(ranking={ranking!r})
+if {eager}:
+    pdi.persona_analyzer.vectorizer
+seconds = time.perf_counter() - started
+status = {{}}
+with open("/proc/self/status") as f:
+    for line in f:
+        key, _, value = line.partition(":")
+        if key in ("VmRSS", "VmHWM"):
+            status[key] = int(value.split()[0])
+print(json.dumps({{"seconds": seconds, "rss_kb": status.get("VmRSS"), "peak_kb": status.get("VmHWM"),
+                  "modules": [m for m in {heavy!r} if sys.modules.get(m) is not None]}}))
+"""
+
+
+def run_profile(name):
+    ranking, allow_sklearn, eager = PROFILES[name]
+    code = CHILD.format(allow_sklearn=allow_sklearn, src=SRC_DIR, ranking=ranking, eager=eager,
+                        heavy=HEAVY_MODULES)
+    completed = subprocess.run([sys.executable, "-W", "ignore", "-c", code],
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=list(PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'profile':<10}{'startup s':>11}{'RSS MB':>9}{'peak MB':>9}  modules")
+    for name in args.profiles:
+        runs = [run_profile(name) for _ in range(args.repeat)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        rss = statistics.median(run["rss_kb"] for run in runs) / 1024
+        peak = statistics.median(run["peak_kb"] for run in runs) / 1024
+        print(f"{name:<10}{seconds:>11.3f}{rss:>9.1f}{peak:>9.1f}  {', '.join(runs[-1]['modules'])}")
+
+
+if __name__ == "__main__":
+    main()
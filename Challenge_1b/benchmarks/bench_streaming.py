@@ -0,0 +1,67 @@
+"""Benchmark peak memory of the in-memory and streaming 1b pipelines as collections grow.
+
+Synthetic collections are built from symlinks to the sample PDFs under
+distinct names. Each collection is run through both pipelines with
+keyword ranking, serially. The script reports the tracemalloc peak of the
+Python heap and checks that both pipelines return the same sections.
+
+    python benchmarks/bench_streaming.py --sizes 7 70 350
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+
+from main import PersonaDocumentIntelligence  # noqa: E402
+
+PERSONA = "Travel Planner"
+JOB = "Plan a trip of 4 days for a group of 10 college friends."
+
+
+def make_collection(directory, size):
+    sources = sorted(glob.glob(os.path.join(ROOT_DIR, "Challenge_1b", "Collection *", "PDFs", "*.pdf")))
+    documents = []
+    for n in range(size):
+        filename = f"{n:05d}-{os.path.basename(sources[n % len(sources)])}"
+        os.symlink(sources[n % len(sources)], os.path.join(directory, filename))
+        documents.append({"filename": filename})
+    return {"documents": documents, "persona": {"role": PERSONA}, "job_to_be_done": {"task": JOB}}
+
+
+def measure(stream, config, pdf_directory):
+    pdi = PersonaDocumentIntelligence(workers=1, ranking="keyword", stream=stream)
+    tracemalloc.start()
+    started = time.perf_counter()
+    output = pdi.process_documents(config, pdf_directory)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / (1024 * 1024), output["extracted_sections"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7, 70, 350])
+    args = parser.parse_args()
+
+    print(f"{'PDFs':>6}{'in-memory s':>13}{'peak MB':>9}{'streaming s':>13}{'peak MB':>9}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            config = make_collection(directory, size)
+            memory_seconds, memory_peak, expected = measure(False, config, directory)
+            stream_seconds, stream_peak, result = measure(True, config, directory)
+        flag = "" if result == expected else "  MISMATCH"
+        print(f"{size:>6}{memory_seconds:>13.2f}{memory_peak:>9.1f}{stream_seconds:>13.2f}{stream_peak:>9.1f}{flag}")
+        if flag:
+            sys.exit(f"streaming ranking differs for {size} PDFs")
+
+
+if __name__ == "__main__":
+    main()
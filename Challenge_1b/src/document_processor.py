@@ -1,24 +1,34 @@
-import PyPDF2
 import re
 import os
-from typing import Dict, List, Tuple
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from extraction_cache import ExtractionCache
+from pdf_backends import PDFBackend, get_backend
+
+# Bump whenever a change can alter page_texts or sections; it is part of the extraction cache key
+PROCESSOR_VERSION = '1b-2'
+
+def _pool_context():
+    # fork keeps the already imported PDF and ML libraries warm in the workers
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('spawn')
 
 class DocumentProcessor:
-    def __init__(self):
+    def __init__(self, backend: Optional[PDFBackend] = None, cache: Optional[ExtractionCache] = None):
         self.documents = {}
+        self.backend = backend or get_backend()
+        self.cache = cache
         
     def extract_text_from_pdf(self, pdf_path: str) -> Dict[int, str]:
         page_texts = {}
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page_num, page in enumerate(pdf_reader.pages, 1):
-                    try:
-                        text = page.extract_text()
-                        if text.strip():
-                            page_texts[page_num] = text
-                    except Exception as e:
-                        continue
+            for page_num, text in self.backend.iter_page_texts(pdf_path):
+                page_texts[page_num] = text
         except Exception as e:
             print(f"Error processing {pdf_path}: {e}")
         return page_texts
@@ -50,25 +60,246 @@ class DocumentProcessor:
         
         return sections
     
-    def process_documents(self, document_paths: List[str]) -> Dict:
+    def heading_key(self, text: str) -> str:
+        return ' '.join(text.replace('–', '-').replace('—', '-').lower().split())
+    
+    def match_outline(self, model) -> Dict[int, str]:
+        # Finds the line each outline entry starts at, scanning forward in reading order within a page
+        # of the entry (text-analysis outlines number pages from 0, TOC outlines from 1). Entries
+        # wrapped over several lines match on their first line. Returns {id(line): heading text}
+        lines = list(model.iter_lines())
+        keys = [self.heading_key(line.text) for line in lines]
+        headings = {}
+        position = 0
+        for entry in model.outline:
+            entry_key = self.heading_key(entry['text'])
+            for i in range(position, len(lines)):
+                if lines[i].page > entry['page'] + 1:
+                    break
+                if lines[i].page < entry['page'] - 1:
+                    continue
+                key = keys[i]
+                if key == entry_key or (len(key) >= 8 and entry_key.startswith(key)):
+                    headings[id(lines[i])] = entry['text']
+                    position = i + 1
+                    break
+        return headings
+    
+    def extract_model_sections(self, model) -> Dict[int, List[Dict]]:
+        # A section runs from an outline heading to the next one, across pages, and is filed under
+        # the page it starts on. Text before the first heading falls back to extract_sections per page
+        headings = self.match_outline(model)
+        doc_sections = {}
+        current = None
+        
+        def add_section(page_num, title, texts):
+            content = self.clean_text(' '.join(texts))
+            if len(content) > 50:
+                sections = doc_sections.setdefault(page_num, [])
+                sections.append({
+                    'title': self.clean_text(title)[:100],
+                    'content': content,
+                    'word_count': len(content.split()),
+                    'section_index': len(sections)
+                })
+        
+        def add_loose(page_num, texts):
+            sections = doc_sections.setdefault(page_num, [])
+            for section in self.extract_sections('\n'.join(texts)):
+                section['section_index'] = len(sections)
+                sections.append(section)
+        
+        for page_num, lines in model.pages:
+            loose = []
+            for line in lines:
+                title = headings.get(id(line))
+                if title is not None:
+                    if loose:
+                        add_loose(page_num, loose)
+                        loose = []
+                    if current is not None:
+                        add_section(*current)
+                    current = (page_num, title, [line.text])
+                elif current is None:
+                    loose.append(line.text)
+                else:
+                    current[2].append(line.text)
+            if loose:
+                add_loose(page_num, loose)
+        if current is not None:
+            add_section(*current)
+        
+        return {page_num: sections for page_num, sections in sorted(doc_sections.items()) if sections}
+    
+    def process_model(self, model) -> Dict:
+        page_texts = {}
+        for page_num, _ in model.pages:
+            text = model.page_text(page_num)
+            if text.strip():
+                page_texts[page_num] = text
+        
+        return {
+            'page_texts': page_texts,
+            'sections': self.extract_model_sections(model),
+            'total_pages': len(page_texts),
+            'title': model.title,
+            'outline': model.outline
+        }
+    
+    def process_document(self, doc_path: str) -> Dict:
+        try:
+            model = self.backend.load_model(doc_path)
+        except Exception as e:
+            print(f"Error processing {doc_path}: {e}")
+            return {'page_texts': {}, 'sections': {}, 'total_pages': 0}
+        if model is not None:
+            return self.process_model(model)
+        
+        page_texts = self.extract_text_from_pdf(doc_path)
+        
+        doc_sections = {}
+        for page_num, text in page_texts.items():
+            sections = self.extract_sections(text)
+            doc_sections[page_num] = sections
+        
+        return {
+            'page_texts': page_texts,
+            'sections': doc_sections,
+            'total_pages': len(page_texts)
+        }
+    
+    def process_documents(self, document_paths: List[str], workers: int = 1) -> Dict:
+        document_paths = [doc_path for doc_path in document_paths if os.path.exists(doc_path)]
+        
+        # Merged in input order so ranking ties resolve the same way as a serial run
         processed_docs = {}
+        for doc_path, doc_data in zip(document_paths, self._process_batch(document_paths, workers)):
+            if doc_data is not None:
+                processed_docs[os.path.basename(doc_path)] = doc_data
+        
+        return processed_docs
+    
+    def iter_documents(self, document_paths: List[str], workers: int = 1) -> Iterator[Tuple[str, Dict]]:
+        # Yields (filename, doc_data) in input order while holding at most 2 * workers documents,
+        # so a consumer that keeps only what it needs runs in flat memory however large the collection
+        document_paths = [doc_path for doc_path in document_paths if os.path.exists(doc_path)]
+        if workers <= 1:
+            for doc_path in document_paths:
+                doc_data = self._process_batch([doc_path], 1)[0]
+                if doc_data is not None:
+                    yield os.path.basename(doc_path), doc_data
+            return
         
-        for doc_path in document_paths:
-            if not os.path.exists(doc_path):
-                continue
+        # One pool for the whole iteration and a sliding window of (path, cache key, future, doc_data):
+        # the next document is submitted as soon as the oldest one has been yielded
+        window = deque()
+        paths = iter(document_paths)
+        pool = None
+        try:
+            while True:
+                while len(window) < 2 * workers:
+                    doc_path = next(paths, None)
+                    if doc_path is None:
+                        break
+                    key, doc_data = self._lookup(doc_path)
+                    future = None
+                    if doc_data is None:
+                        if pool is None:
+                            pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+                        future = self._submit(pool, doc_path)
+                    window.append((doc_path, key, future, doc_data))
+                if not window:
+                    break
                 
-            filename = os.path.basename(doc_path)
-            page_texts = self.extract_text_from_pdf(doc_path)
-            
-            doc_sections = {}
-            for page_num, text in page_texts.items():
-                sections = self.extract_sections(text)
-                doc_sections[page_num] = sections
-            
-            processed_docs[filename] = {
-                'page_texts': page_texts,
-                'sections': doc_sections,
-                'total_pages': len(page_texts)
-            }
-        
-        return processed_docs
\ No newline at end of file
+                doc_path, key, future, doc_data = window.popleft()
+                if future is not None:
+                    try:
+                        doc_data = future.result()
+                    except BrokenProcessPool:
+                        # Same recovery as _process_in_pool: this document is retried alone, and
+                        # the rest of the window is resubmitted to a fresh pool
+                        pool.shutdown(wait=True)
+                        pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+                        window = deque(
+                            (path, pending_key, self._submit(pool, path) if pending else None, data)
+                            for path, pending_key, pending, data in window
+                        )
+                        doc_data = self._process_in_pool([doc_path], 1)[0]
+                    except Exception as e:
+                        print(f"Error processing {doc_path}: {e}")
+                        doc_data = None
+                    self._store(key, doc_data)
+                if doc_data is not None:
+                    yield os.path.basename(doc_path), doc_data
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+    
+    def _submit(self, pool: ProcessPoolExecutor, doc_path: str) -> Future:
+        # A pool that broke before this submit fails the future instead, so it is recovered in order
+        try:
+            return pool.submit(self.process_document, doc_path)
+        except BrokenProcessPool as e:
+            future = Future()
+            future.set_exception(e)
+            return future
+    
+    def _lookup(self, doc_path: str) -> Tuple[Optional[str], Optional[Dict]]:
+        if self.cache is None:
+            return None, None
+        key = self.cache.key_for(doc_path, self.backend.key)
+        return key, self.cache.get(key)
+    
+    def _store(self, key: Optional[str], doc_data: Optional[Dict]):
+        # Documents without any text are not cached, so a transient read error is retried next run
+        if self.cache is not None and doc_data is not None and doc_data['total_pages'] > 0:
+            self.cache.put(key, doc_data)
+    
+    def _process_batch(self, document_paths: List[str], workers: int) -> List[Optional[Dict]]:
+        # Cache lookups and stores stay in this process, so only misses reach the pool
+        results = [None] * len(document_paths)
+        keys = [None] * len(document_paths)
+        for i, doc_path in enumerate(document_paths):
+            keys[i], results[i] = self._lookup(doc_path)
+        misses = [i for i, doc_data in enumerate(results) if doc_data is None]
+        miss_paths = [document_paths[i] for i in misses]
+        
+        if workers > 1 and len(miss_paths) > 1:
+            miss_results = self._process_in_pool(miss_paths, workers)
+        else:
+            miss_results = [self.process_document(doc_path) for doc_path in miss_paths]
+        
+        for i, doc_data in zip(misses, miss_results):
+            results[i] = doc_data
+            self._store(keys[i], doc_data)
+        
+        return results
+    
+    def _process_in_pool(self, document_paths: List[str], workers: int) -> List[Optional[Dict]]:
+        results = [None] * len(document_paths)
+        pending = list(range(len(document_paths)))
+        
+        # A crashed worker breaks the whole pool; the unfinished documents are then
+        # retried one per fresh single-worker pool so only the culprit is lost
+        pool_size = min(workers, len(pending))
+        while pending:
+            broken = []
+            batches = [pending] if pool_size > 1 else [[i] for i in pending]
+            for batch in batches:
+                with ProcessPoolExecutor(max_workers=min(pool_size, len(batch)), mp_context=_pool_context()) as pool:
+                    futures = {pool.submit(self.process_document, document_paths[i]): i for i in batch}
+                    for future in as_completed(futures):
+                        i = futures[future]
+                        try:
+                            results[i] = future.result()
+                        except BrokenProcessPool:
+                            if pool_size > 1:
+                                broken.append(i)
+                            else:
+                                print(f"Error processing {document_paths[i]}: worker process died")
+                        except Exception as e:
+                            print(f"Error processing {document_paths[i]}: {e}")
+            pending = sorted(broken)
+            pool_size = 1
+        
+        return results
\ No newline at end of file
@@ -0,0 +1,118 @@
+import re
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'into', 'is',
+    'it', 'its', 'of', 'on', 'or', 'that', 'the', 'their', 'this', 'to', 'was', 'were', 'will', 'with',
+    'you', 'your'
+))
+
+class Encoder:
+    # Turns texts into L2-normalised float32 rows, so a dot product is a cosine similarity
+    name = ''
+
+    @property
+    def key(self) -> str:
+        # Distinguishes cached embeddings of differently configured encoders
+        return self.name
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+class HashingEncoder(Encoder):
+    # Deterministic and dependency free: unigrams and bigrams hashed with crc32 into a fixed
+    # number of signed buckets. Python's hash() is salted per process, so it cannot be used here
+    name = 'hashing'
+
+    def __init__(self, dimension: int = 512):
+        self.dimension = dimension
+
+    @property
+    def key(self) -> str:
+        return f'{self.name}:{self.dimension}'
+
+    def _features(self, text: str) -> List[int]:
+        tokens = [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+        grams = tokens + [f'{first} {second}' for first, second in zip(tokens, tokens[1:])]
+        return [zlib.crc32(gram.encode('utf-8')) for gram in grams]
+
+    def _hashed(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows, columns, signs = [], [], []
+        for row, text in enumerate(texts):
+            hashes = np.asarray(self._features(text), dtype=np.uint32)
+            rows.append(np.full(len(hashes), row, dtype=np.intp))
+            columns.append((hashes % self.dimension).astype(np.intp))
+            signs.append(np.where(hashes & 0x80000000, -1.0, 1.0))
+        if not rows:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0)
+        return np.concatenate(rows), np.concatenate(columns), np.concatenate(signs)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        rows, columns, signs = self._hashed(texts)
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        np.add.at(vectors, (rows, columns), signs)
+        # Sublinear term frequency keeps one repeated word from dominating the section
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def encode_sparse(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Same vectors as encode() as (row, column, weight) triples, for large dimensions or many short texts
+        rows, columns, signs = self._hashed(texts)
+        keys, inverse = np.unique(rows * self.dimension + columns, return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=signs, minlength=len(keys))
+        nonzero = counts != 0
+        keys, counts = keys[nonzero], counts[nonzero]
+        rows, columns = keys // self.dimension, keys % self.dimension
+        weights = np.sign(counts) * np.log1p(np.abs(counts))
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(texts)))
+        return rows, columns, (weights / np.maximum(norms[rows], 1e-12)).astype(np.float32)
+
+class SentenceTransformerEncoder(Encoder):
+    # Offline only: model must be a local directory holding a sentence-transformers model
+    name = 'sentence-transformers'
+
+    def __init__(self, model: str, batch_size: int = 32):
+        self.model_path = model
+        self.batch_size = batch_size
+        self._model = None
+
+    @property
+    def key(self) -> str:
+        return f'{self.name}:{self.model_path}'
+
+    def __getstate__(self):
+        # The loaded model stays behind; pool workers load their own copy on first use
+        state = self.__dict__.copy()
+        state['_model'] = None
+        return state
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_path, device='cpu')
+        vectors = self._model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True,
+                                     normalize_embeddings=True, show_progress_bar=False)
+        return vectors.astype(np.float32, copy=False)
+
+ENCODERS = {
+    HashingEncoder.name: HashingEncoder,
+    SentenceTransformerEncoder.name: SentenceTransformerEncoder
+}
+
+def get_encoder(spec: str) -> Encoder:
+    # "<name>" or "<name>:<model path>", e.g. "hashing" or "sentence-transformers:/models/all-MiniLM-L6-v2"
+    name, _, model = spec.partition(':')
+    name = name.lower()
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown encoder {name!r}, expected one of {', '.join(ENCODERS)}")
+    if name == SentenceTransformerEncoder.name:
+        if not model:
+            raise ValueError('The sentence-transformers encoder needs a local model path: '
+                             'sentence-transformers:<path>')
+        return SentenceTransformerEncoder(model)
+    return ENCODERS[name](int(model)) if model else ENCODERS[name]()
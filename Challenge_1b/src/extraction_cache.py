@@ -0,0 +1,110 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+from typing import Dict, Optional
+
+CHUNK_SIZE = 1 << 20
+
+class ExtractionCache:
+    # SQLite in WAL mode lets several runs read while one writes; writers wait on busy_timeout.
+    # The connection is opened on first use and per process: forked pool workers inherit this
+    # object without pickling, and SQLite connections must not be used across fork()
+    def __init__(self, path: str, version: str, max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.version = version
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._pid = None
+        self._inherited = None
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def __getstate__(self):
+        # Connections do not cross process boundaries; workers reopen on first use
+        state = self.__dict__.copy()
+        state['_conn'] = state['_inherited'] = None
+        return state
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None and self._pid != os.getpid():
+            # Inherited through fork: keep the parent's handle alive but untouched, not even closed
+            self._inherited = self._conn
+            self._conn = None
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS documents ('
+                'key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS documents_last_used ON documents (last_used)')
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def key_for(self, pdf_path: str, backend_key: str = '') -> str:
+        digest = hashlib.sha256(f"{self.version}:{backend_key}".encode('utf-8') + b'\0')
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        conn = self._connect()
+        row = conn.execute('SELECT data FROM documents WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            doc_data = pickle.loads(zlib.decompress(row[0]))
+        except Exception:
+            self.misses += 1
+            return None
+        conn.execute('UPDATE documents SET last_used = ? WHERE key = ?', (time.time(), key))
+        self.hits += 1
+        return doc_data
+
+    def put(self, key: str, doc_data: Dict):
+        # Pickle keeps the int page keys and loads far faster than re-parsing; zlib level 1 is cheap to undo
+        blob = zlib.compress(pickle.dumps(doc_data, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO documents (key, data, size, last_used) VALUES (?, ?, ?, ?)',
+                (key, blob, len(blob), time.time())
+            )
+            self._evict(conn)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _evict(self, conn: sqlite3.Connection, target_ratio: float = 0.9):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM documents').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * target_ratio
+        for key, size in conn.execute('SELECT key, size FROM documents ORDER BY last_used').fetchall():
+            if total <= target:
+                break
+            conn.execute('DELETE FROM documents WHERE key = ?', (key,))
+            total -= size
+
+    def stats(self) -> str:
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return f"Extraction cache: {self.hits} hits, {self.misses} misses ({hit_rate:.0%} hit rate)"
+
+    def close(self):
+        if self._conn is not None and self._pid != os.getpid():
+            self._inherited = self._conn
+        elif self._conn is not None:
+            self._conn.close()
+        self._conn = None
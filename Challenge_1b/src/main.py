@@ -1,18 +1,25 @@
+import argparse
 import json
 import os
 import sys
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from document_processor import DocumentProcessor
-from persona_analyzer import PersonaAnalyzer
-from section_extractor import SectionExtractor
+from document_processor import PROCESSOR_VERSION, DocumentProcessor
+from encoders import get_encoder
+from extraction_cache import ExtractionCache
+from persona_analyzer import RANKING_METHODS, PersonaAnalyzer, default_ranking, iter_sections
+from reranker import Reranker
+from section_extractor import REFINEMENT_METHODS, SectionExtractor
 
 class PersonaDocumentIntelligence:
-    def __init__(self):
-        self.doc_processor = DocumentProcessor()
-        self.persona_analyzer = PersonaAnalyzer()
-        self.section_extractor = SectionExtractor()
+    def __init__(self, workers: int = 1, ranking: str = 'keyword', cache: Optional[ExtractionCache] = None,
+                 reranker: Optional[Reranker] = None, stream: bool = False, refinement: str = 'query'):
+        self.workers = workers
+        self.stream = stream
+        self.doc_processor = DocumentProcessor(cache=cache)
+        self.persona_analyzer = PersonaAnalyzer(ranking=ranking, reranker=reranker)
+        self.section_extractor = SectionExtractor(refinement=refinement)
     
     def load_input_config(self, input_path: str) -> Dict:
         try:
@@ -22,7 +29,7 @@ class PersonaDocumentIntelligence:
             print(f"Error loading input config: {e}")
             return {}
     
-    def process_documents(self, config: Dict, pdf_directory: str) -> Dict:
+    def resolve_documents(self, config: Dict, pdf_directory: str) -> Tuple[List[str], List[str]]:
         document_paths = []
         input_documents = []
         
@@ -33,17 +40,57 @@ class PersonaDocumentIntelligence:
                 document_paths.append(pdf_path)
                 input_documents.append(filename)
         
-        processed_docs = self.doc_processor.process_documents(document_paths)
-        
+        return input_documents, document_paths
+    
+    def load_documents(self, config: Dict, pdf_directory: str) -> Tuple[List[str], Dict]:
+        input_documents, document_paths = self.resolve_documents(config, pdf_directory)
+        processed_docs = self.doc_processor.process_documents(document_paths, workers=self.workers)
+        return input_documents, processed_docs
+    
+    def stream_sections(self, document_paths: List[str],
+                        stats: Optional[Dict] = None) -> Iterator[Tuple[str, int, Dict]]:
+        # Each document's page texts and unselected sections are dropped as soon as it has been scored
+        for document, doc_data in self.doc_processor.iter_documents(document_paths, workers=self.workers):
+            if stats is not None:
+                stats['documents'] += 1
+                stats['pages'] += doc_data['total_pages']
+                stats['sections'] += sum(len(sections) for sections in doc_data['sections'].values())
+            yield from iter_sections({document: doc_data})
+    
+    def process_documents(self, config: Dict, pdf_directory: str, stats: Optional[Dict] = None) -> Dict:
         persona = config.get('persona', {}).get('role', 'General User')
         job_description = config.get('job_to_be_done', {}).get('task', 'General analysis')
         
+        if self.stream:
+            input_documents, document_paths = self.resolve_documents(config, pdf_directory)
+            ranked_sections = self.persona_analyzer.rank_stream(
+                self.stream_sections(document_paths, stats), persona, job_description
+            )
+            return self.build_output(input_documents, ranked_sections, persona, job_description)
+        
+        input_documents, processed_docs = self.load_documents(config, pdf_directory)
+        if stats is not None:
+            stats['documents'] += len(processed_docs)
+            stats['pages'] += sum(doc['total_pages'] for doc in processed_docs.values())
+            stats['sections'] += sum(len(sections) for doc in processed_docs.values()
+                                     for sections in doc['sections'].values())
+        
+        return self.answer_query(input_documents, processed_docs, persona, job_description)
+    
+    def answer_query(self, input_documents: List[str], processed_docs: Dict, persona: str,
+                     job_description: str) -> Dict:
         ranked_sections = self.persona_analyzer.rank_sections(
             processed_docs, persona, job_description
         )
-        
+        return self.build_output(input_documents, ranked_sections, persona, job_description)
+    
+    def build_output(self, input_documents: List[str], ranked_sections: List[Dict], persona: str,
+                     job_description: str) -> Dict:
         extracted_sections = self.section_extractor.format_extracted_sections(ranked_sections)
-        subsection_analysis = self.section_extractor.generate_subsection_analysis(ranked_sections)
+        query = self.persona_analyzer.build_query(
+            persona, job_description, self.persona_analyzer.build_matcher(persona, job_description)
+        )
+        subsection_analysis = self.section_extractor.generate_subsection_analysis(ranked_sections, query)
         
         output = {
             "metadata": {
@@ -66,13 +113,35 @@ class PersonaDocumentIntelligence:
         except Exception as e:
             print(f"Error saving output: {e}")
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rank the sections of a PDF collection for a persona and task",
+        epilog="Example: python main.py Collection\\ 1"
+    )
+    parser.add_argument("collection_path")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="processes extracting documents in parallel (0 = one per CPU core, 1 = serial)")
+    parser.add_argument("--ranking", choices=RANKING_METHODS, default=default_ranking(),
+                        help="hybrid blends keyword heuristics with TF-IDF similarity; keyword is heuristics only")
+    parser.add_argument("--cache", default=None,
+                        help="SQLite file caching extracted pages and sections by PDF content hash")
+    parser.add_argument("--cache-max-mb", type=float, default=512,
+                        help="size bound of the extraction cache before LRU eviction")
+    parser.add_argument("--rerank", default=None, metavar="ENCODER",
+                        help="rerank the top sections with an encoder: hashing or sentence-transformers:<model dir>")
+    parser.add_argument("--rerank-top-n", type=int, default=50,
+                        help="sections from the first ranking stage passed to the encoder")
+    parser.add_argument("--rerank-budget-ms", type=float, default=None,
+                        help="encoding time allowed per query; sections not reached get the mean similarity of the rest")
+    parser.add_argument("--refinement", choices=REFINEMENT_METHODS, default="query",
+                        help="query picks the sentences most relevant to the persona and task; leading keeps the opening ones")
+    parser.add_argument("--stream", action="store_true",
+                        help="score documents as they are extracted, keeping only the best sections in memory")
+    return parser.parse_args(argv)
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python main.py <collection_path>")
-        print("Example: python main.py Collection\ 1")
-        sys.exit(1)
-    
-    collection_path = sys.argv[1]
+    args = parse_args()
+    collection_path = args.collection_path
     
     if not os.path.exists(collection_path):
         print(f"Collection path does not exist: {collection_path}")
@@ -90,7 +159,17 @@ def main():
         print(f"PDF directory not found: {pdf_directory}")
         sys.exit(1)
     
-    pdi = PersonaDocumentIntelligence()
+    cache = None
+    if args.cache:
+        cache = ExtractionCache(args.cache, PROCESSOR_VERSION, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    
+    reranker = None
+    if args.rerank:
+        reranker = Reranker(get_encoder(args.rerank), top_n=args.rerank_top_n, budget_ms=args.rerank_budget_ms)
+    
+    pdi = PersonaDocumentIntelligence(workers=args.workers if args.workers > 0 else os.cpu_count() or 1,
+                                      ranking=args.ranking, cache=cache, reranker=reranker,
+                                      stream=args.stream, refinement=args.refinement)
     
     print("Loading input configuration...")
     config = pdi.load_input_config(input_file)
@@ -101,6 +180,11 @@ def main():
     
     print("Processing documents...")
     output = pdi.process_documents(config, pdf_directory)
+    if cache is not None:
+        print(cache.stats())
+        cache.close()
+    if reranker is not None:
+        print(reranker.stats())
     
     print("Saving output...")
     pdi.save_output(output, output_file)
@@ -0,0 +1,128 @@
+import os
+import sys
+from typing import Dict, Iterator, Optional, Tuple
+
+DEFAULT_BACKENDS = ('model', 'pymupdf', 'pypdf2')
+
+class PDFBackend:
+    name = ''
+
+    def __reduce__(self):
+        # Backends hold module handles; pool workers rebuild them from the class instead
+        return (self.__class__, ())
+
+    @property
+    def key(self) -> str:
+        # Part of the extraction cache key: whatever besides the PDF bytes decides this backend's output
+        return self.name
+
+    def iter_page_texts(self, pdf_path: str) -> Iterator[Tuple[int, str]]:
+        raise NotImplementedError
+
+    def extract_page_texts(self, pdf_path: str) -> Dict[int, str]:
+        return dict(self.iter_page_texts(pdf_path))
+
+    def load_model(self, pdf_path: str):
+        # Backends that only produce page texts have no document model
+        return None
+
+def _import_document_model():
+    # The document model lives with the outline extractor in Challenge_1a; CHALLENGE_1A_DIR points
+    # at it when the two challenges are not checked out side by side
+    try:
+        import document_model
+    except ImportError:
+        root = os.environ.get('CHALLENGE_1A_DIR') or os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'Challenge_1a'
+        )
+        if not os.path.isfile(os.path.join(root, 'document_model.py')):
+            raise ImportError(f"document_model not found in {root}; set CHALLENGE_1A_DIR")
+        sys.path.append(root)
+        import document_model
+    return document_model
+
+class DocumentModelBackend(PDFBackend):
+    # One PyMuPDF parse into font-aware lines plus the Challenge_1a outline, so sections can
+    # start at real headings. DOCUMENT_MODEL_CACHE shares parsed models with process_pdfs.py --model-cache
+    name = 'model'
+
+    def __init__(self):
+        self.document_model = _import_document_model()
+        self.cache = None
+        cache_dir = os.environ.get('DOCUMENT_MODEL_CACHE')
+        if cache_dir:
+            # Pool workers rebuild the backend for every task; the shared instance keeps the cache's size estimate
+            from result_cache import shared_cache
+            self.cache = shared_cache(cache_dir, self.document_model.MODEL_VERSION)
+
+    @property
+    def key(self) -> str:
+        # Sections follow the Challenge_1a outline, so an extractor change must invalidate them too
+        return f'{self.name}:{self.document_model.MODEL_VERSION}'
+
+    def load_model(self, pdf_path: str):
+        model, _ = self.document_model.load_document_model(pdf_path, self.cache)
+        return model
+
+    def iter_page_texts(self, pdf_path: str) -> Iterator[Tuple[int, str]]:
+        model = self.load_model(pdf_path)
+        for page_num, _ in model.pages:
+            text = model.page_text(page_num)
+            if text.strip():
+                yield page_num, text
+
+class PyMuPDFBackend(PDFBackend):
+    name = 'pymupdf'
+
+    def __init__(self):
+        import fitz
+        self.fitz = fitz
+
+    def iter_page_texts(self, pdf_path: str) -> Iterator[Tuple[int, str]]:
+        with self.fitz.open(pdf_path) as doc:
+            for page_num, page in enumerate(doc, 1):
+                try:
+                    text = page.get_text()
+                except Exception:
+                    continue
+                if text.strip():
+                    yield page_num, text
+
+class PyPDF2Backend(PDFBackend):
+    name = 'pypdf2'
+
+    def __init__(self):
+        import PyPDF2
+        self.PyPDF2 = PyPDF2
+
+    def iter_page_texts(self, pdf_path: str) -> Iterator[Tuple[int, str]]:
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = self.PyPDF2.PdfReader(file)
+            for page_num, page in enumerate(pdf_reader.pages, 1):
+                try:
+                    text = page.extract_text()
+                except Exception:
+                    continue
+                if text.strip():
+                    yield page_num, text
+
+BACKENDS = {
+    DocumentModelBackend.name: DocumentModelBackend,
+    PyMuPDFBackend.name: PyMuPDFBackend,
+    PyPDF2Backend.name: PyPDF2Backend
+}
+
+def get_backend(name: Optional[str] = None) -> PDFBackend:
+    # An explicit name (argument or PDF_BACKEND) must load; otherwise the first installed default wins
+    name = name or os.environ.get('PDF_BACKEND')
+    if name:
+        if name.lower() not in BACKENDS:
+            raise ValueError(f"Unknown PDF backend {name!r}, expected one of {', '.join(BACKENDS)}")
+        return BACKENDS[name.lower()]()
+
+    for candidate in DEFAULT_BACKENDS:
+        try:
+            return BACKENDS[candidate]()
+        except ImportError:
+            continue
+    raise ImportError(f"No PDF backend available, install one of {', '.join(DEFAULT_BACKENDS)}")
@@ -1,18 +1,79 @@
+import heapq
+import itertools
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import os
 import re
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from reranker import Reranker
+    from section_index import SectionIndex
+
+RANKING_METHODS = ('hybrid', 'keyword')
+STRUCTURE_MARKERS = (':', '-', '•', '1.', '2.', '3.')
+STREAM_POOL_SIZE = 200
+STREAM_CHUNK_SIZE = 256
+
+class KeywordMatcher:
+    # Built once per query. Substring probes run through str.__contains__ in C, which on
+    # CPython beats a regex alternation or automaton that has to step through every character
+    def __init__(self, keywords: List[str]):
+        self.keywords = tuple(sorted(set(keywords)))
+        self.total_keywords = len(self.keywords)
+    
+    def count_matches(self, content_lower: str) -> int:
+        return sum(map(content_lower.__contains__, self.keywords))
+
+def top_k_indices(scores: np.ndarray, k: int) -> List[int]:
+    # Same order as a stable descending sort cut at k: ties keep their input order
+    if k <= 0 or len(scores) == 0:
+        return []
+    if len(scores) > k:
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(len(scores))
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]].tolist()
+
+def iter_sections(sections_data: Dict) -> Iterator[Tuple[str, int, Dict]]:
+    for document, doc_data in sections_data.items():
+        for page_num, sections in doc_data['sections'].items():
+            for section in sections:
+                yield document, page_num, section
+
+def default_ranking() -> str:
+    # PERSONA_RANKING=hybrid switches every entry point to TF-IDF blending without passing --ranking
+    return os.environ.get('PERSONA_RANKING', 'keyword')
 
 class PersonaAnalyzer:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
+    def __init__(self, ranking: str = 'keyword', tfidf_weight: float = 0.5, reranker: Optional['Reranker'] = None):
+        if ranking not in RANKING_METHODS:
+            raise ValueError(f"Unknown ranking {ranking!r}, expected one of {', '.join(RANKING_METHODS)}")
+        self._vectorizer = None
+        self.ranking = ranking
+        self.tfidf_weight = tfidf_weight
+        self.reranker = reranker
+        self.index = None
         self.persona_keywords = {}
         self.job_keywords = {}
+    
+    @property
+    def vectorizer(self):
+        # scikit-learn (and the SciPy stack under it) takes most of the cold start, so it is
+        # only imported once hybrid ranking actually needs the TF-IDF index
+        if self._vectorizer is None:
+            try:
+                from sklearn.feature_extraction.text import TfidfVectorizer
+            except ImportError as e:
+                raise ImportError("Hybrid ranking needs scikit-learn; install requirements.txt "
+                                  "or use --ranking keyword") from e
+            self._vectorizer = TfidfVectorizer(
+                max_features=1000,
+                stop_words='english',
+                ngram_range=(1, 2)
+            )
+        return self._vectorizer
         
     def extract_persona_keywords(self, persona: str) -> List[str]:
         persona_mapping = {
@@ -54,54 +115,126 @@ class PersonaAnalyzer:
         
         return keywords
     
-    def calculate_relevance_score(self, section_content: str, persona: str, job_description: str) -> float:
-        persona_keywords = self.extract_persona_keywords(persona)
-        job_keywords = self.extract_job_keywords(job_description)
-        
-        all_keywords = list(set(persona_keywords + job_keywords))
-        
-        content_lower = section_content.lower()
-        keyword_matches = 0
-        total_keywords = len(all_keywords)
-        
-        for keyword in all_keywords:
-            if keyword in content_lower:
-                keyword_matches += 1
+    def build_matcher(self, persona: str, job_description: str) -> KeywordMatcher:
+        return KeywordMatcher(self.extract_persona_keywords(persona) + self.extract_job_keywords(job_description))
+    
+    def build_query(self, persona: str, job_description: str, matcher: KeywordMatcher) -> str:
+        # The mapped keywords expand the short persona/job text into something TF-IDF can match
+        return ' '.join([persona, job_description] + list(matcher.keywords))
+    
+    def get_index(self, contents: List[str]) -> 'SectionIndex':
+        # Refit only when the collection changes; repeated queries reuse the fitted vocabulary and matrix
+        key = (len(contents), hash(tuple(contents)))
+        if self.index is None or self.index.key != key:
+            vectorizer = self.vectorizer
+            from section_index import SectionIndex
+            self.index = SectionIndex(vectorizer, key).fit(contents)
+        return self.index
+    
+    def score_contents(self, contents: List[str], matcher: KeywordMatcher,
+                       word_counts: Optional[List[int]] = None) -> np.ndarray:
+        count = len(contents)
+        keyword_matches = np.empty(count, dtype=np.float64)
+        has_structure = np.empty(count, dtype=bool)
+        for i, content in enumerate(contents):
+            content_lower = content.lower()
+            keyword_matches[i] = matcher.count_matches(content_lower)
+            has_structure[i] = any(map(content_lower.__contains__, STRUCTURE_MARKERS))
+        if word_counts is None:
+            word_counts = [len(content.split()) for content in contents]
+        
+        keyword_score = keyword_matches / max(matcher.total_keywords, 1)
+        length_score = np.minimum(np.asarray(word_counts, dtype=np.float64) / 100, 1.0)
+        structure_score = np.where(has_structure, 0.3, 0.0)
         
-        keyword_score = keyword_matches / max(total_keywords, 1)
+        final_score = (keyword_score * 0.6) + (length_score * 0.2) + (structure_score * 0.2)
         
-        length_score = min(len(section_content.split()) / 100, 1.0)
+        return np.minimum(final_score, 1.0)
+    
+    def calculate_relevance_score(self, section_content: str, persona: str, job_description: str,
+                                  matcher: Optional[KeywordMatcher] = None) -> float:
+        matcher = matcher or self.build_matcher(persona, job_description)
+        return float(self.score_contents([section_content], matcher)[0])
+    
+    def rank_sections(self, sections_data: Dict, persona: str, job_description: str, top_k: int = 10) -> List[Dict]:
+        matcher = self.build_matcher(persona, job_description)
         
-        structure_score = 0.0
-        if any(marker in content_lower for marker in [':', '-', '•', '1.', '2.', '3.']):
-            structure_score = 0.3
+        located = list(iter_sections(sections_data))
+        contents = [section['content'] for _, _, section in located]
+        # extract_sections stores len(content.split()) here, no need to split again
+        word_counts = [section['word_count'] for _, _, section in located]
         
-        final_score = (keyword_score * 0.6) + (length_score * 0.2) + (structure_score * 0.2)
+        query = self.build_query(persona, job_description, matcher)
+        scores = self.score_contents(contents, matcher, word_counts)
+        if self.ranking == 'hybrid':
+            similarity = self.get_index(contents).query(query)
+            scores = (1 - self.tfidf_weight) * scores + self.tfidf_weight * similarity
         
-        return min(final_score, 1.0)
+        return self._select_ranked(located, contents, scores, query, top_k)
+    
+    def rank_stream(self, sections: Iterable[Tuple[str, int, Dict]], persona: str, job_description: str,
+                    top_k: int = 10, pool_size: int = STREAM_POOL_SIZE) -> List[Dict]:
+        # Consumes (document, page_num, section) lazily, scoring chunk by chunk into a bounded
+        # min-heap, so memory does not grow with the collection. Keyword ranking matches
+        # rank_sections exactly. The TF-IDF index of hybrid ranking needs every candidate at
+        # once, so here it is fitted on the pool_size best keyword-scored sections only
+        matcher = self.build_matcher(persona, job_description)
+        query = self.build_query(persona, job_description, matcher)
+        keep = top_k
+        if self.ranking == 'hybrid':
+            keep = max(keep, pool_size)
+        if self.reranker is not None:
+            keep = max(keep, self.reranker.top_n)
+        
+        # (score, -position) orders the heap like a stable descending sort: among equal
+        # scores the later section is the first to be evicted
+        heap = []
+        position = itertools.count()
+        sections = iter(sections)
+        while True:
+            chunk = list(itertools.islice(sections, STREAM_CHUNK_SIZE))
+            if not chunk:
+                break
+            scores = self.score_contents([section['content'] for _, _, section in chunk], matcher,
+                                         [section['word_count'] for _, _, section in chunk])
+            for (document, page_num, section), score in zip(chunk, scores.tolist()):
+                item = (score, -next(position), document, page_num, section)
+                if len(heap) < keep:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heappushpop(heap, item)
+        
+        heap.sort(key=lambda item: (-item[0], -item[1]))
+        located = [(document, page_num, section) for _, _, document, page_num, section in heap]
+        contents = [section['content'] for _, _, section in located]
+        scores = np.array([item[0] for item in heap], dtype=np.float64)
+        if self.ranking == 'hybrid' and located:
+            similarity = self.get_index(contents).query(query)
+            scores = (1 - self.tfidf_weight) * scores + self.tfidf_weight * similarity
+        
+        return self._select_ranked(located, contents, scores, query, top_k)
     
-    def rank_sections(self, sections_data: Dict, persona: str, job_description: str) -> List[Dict]:
-        all_sections = []
-        
-        for document, doc_data in sections_data.items():
-            for page_num, sections in doc_data['sections'].items():
-                for section in sections:
-                    relevance_score = self.calculate_relevance_score(
-                        section['content'], persona, job_description
-                    )
-                    
-                    all_sections.append({
-                        'document': document,
-                        'section_title': section['title'],
-                        'content': section['content'],
-                        'page_number': page_num,
-                        'relevance_score': relevance_score,
-                        'word_count': section['word_count']
-                    })
-        
-        all_sections.sort(key=lambda x: x['relevance_score'], reverse=True)
-        
-        for i, section in enumerate(all_sections, 1):
-            section['importance_rank'] = i
-        
-        return all_sections[:10]
\ No newline at end of file
+    def _select_ranked(self, located: List[Tuple[str, int, Dict]], contents: List[str], scores: np.ndarray,
+                       query: str, top_k: int) -> List[Dict]:
+        if self.reranker is not None:
+            # The cheap scores pick the candidates; only those are encoded and re-scored
+            candidates = top_k_indices(scores, max(self.reranker.top_n, top_k))
+            reranked = self.reranker.rerank(query, [contents[i] for i in candidates], scores[candidates])
+            selected = [(candidates[j], reranked[j]) for j in top_k_indices(reranked, top_k)]
+        else:
+            selected = [(i, scores[i]) for i in top_k_indices(scores, top_k)]
+        
+        ranked_sections = []
+        for rank, (i, score) in enumerate(selected, 1):
+            document, page_num, section = located[i]
+            ranked_sections.append({
+                'document': document,
+                'section_title': section['title'],
+                'content': section['content'],
+                'page_number': page_num,
+                'relevance_score': float(score),
+                'word_count': section['word_count'],
+                'importance_rank': rank
+            })
+        
+        return ranked_sections
\ No newline at end of file
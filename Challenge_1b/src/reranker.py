@@ -0,0 +1,92 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+from encoders import Encoder
+
+class EmbeddingCache:
+    # In-process LRU keyed by content hash, so repeated queries over a collection skip encoding
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key_for(self, encoder_key: str, text: str) -> bytes:
+        return hashlib.blake2b(f"{encoder_key}\0{text}".encode('utf-8'), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        vector = self._entries.get(key)
+        if vector is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return vector
+
+    def put(self, key: bytes, vector: np.ndarray):
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> str:
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return f"Embedding cache: {self.hits} hits, {self.misses} misses ({hit_rate:.0%} hit rate), {len(self)} entries"
+
+class Reranker:
+    # Second ranking stage: only the first stage's top_n sections are encoded, best first, in
+    # batches, until the per-query budget runs out. Sections left unencoded are blended with the mean
+    # similarity of the encoded ones, so both end up on the same scale and keep their relative order
+    def __init__(self, encoder: Encoder, top_n: int = 50, batch_size: int = 32, budget_ms: Optional[float] = None,
+                 weight: float = 0.5, cache: Optional[EmbeddingCache] = None):
+        self.encoder = encoder
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.budget_ms = budget_ms
+        self.weight = weight
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.encoded = 0
+        self.skipped = 0
+
+    def embed(self, texts: List[str], deadline: Optional[float] = None) -> List[Optional[np.ndarray]]:
+        encoder_key = self.encoder.key
+        keys = [self.cache.key_for(encoder_key, text) for text in texts]
+        vectors = [self.cache.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        for start in range(0, len(missing), self.batch_size):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            batch = missing[start:start + self.batch_size]
+            for i, vector in zip(batch, self.encoder.encode([texts[i] for i in batch])):
+                self.cache.put(keys[i], vector)
+                vectors[i] = vector
+            self.encoded += len(batch)
+        return vectors
+
+    def rerank(self, query: str, contents: List[str], scores: np.ndarray) -> np.ndarray:
+        # contents and scores are the first-stage candidates, best first
+        deadline = None
+        if self.budget_ms is not None:
+            deadline = time.perf_counter() + self.budget_ms / 1000.0
+        query_vector = self.embed([query])[0]
+        vectors = self.embed(contents, deadline)
+
+        encoded = np.array([vector is not None for vector in vectors], dtype=bool)
+        self.skipped += int(len(vectors) - encoded.sum())
+        similarity = np.zeros(len(vectors), dtype=np.float64)
+        if encoded.any():
+            matrix = np.vstack([vector for vector in vectors if vector is not None])
+            similarity[encoded] = np.clip(matrix @ query_vector, 0.0, 1.0)
+            similarity[~encoded] = similarity[encoded].mean()
+        return (1 - self.weight) * np.asarray(scores, dtype=np.float64) + self.weight * similarity
+
+    def stats(self) -> str:
+        return f"Reranker ({self.encoder.key}): {self.encoded} sections encoded, {self.skipped} skipped by budget; {self.cache.stats()}"
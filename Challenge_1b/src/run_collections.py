@@ -0,0 +1,144 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from document_processor import PROCESSOR_VERSION, _pool_context
+from encoders import get_encoder
+from extraction_cache import ExtractionCache
+from main import PersonaDocumentIntelligence
+from persona_analyzer import RANKING_METHODS, default_ranking
+from reranker import Reranker
+from section_extractor import REFINEMENT_METHODS
+
+_worker_pdi = None
+
+def discover_collections(root: str) -> List[str]:
+    collections = []
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        if os.path.isfile(os.path.join(path, 'challenge1b_input.json')) and os.path.isdir(os.path.join(path, 'PDFs')):
+            collections.append(path)
+    return collections
+
+def process_collection(pdi: PersonaDocumentIntelligence, collection_path: str) -> Dict:
+    started = time.perf_counter()
+    stats = {'collection': collection_path, 'status': 'ok', 'documents': 0, 'pages': 0, 'sections': 0}
+    config = pdi.load_input_config(os.path.join(collection_path, 'challenge1b_input.json'))
+    if not config:
+        stats['status'] = 'error'
+        stats['seconds'] = time.perf_counter() - started
+        return stats
+
+    output = pdi.process_documents(config, os.path.join(collection_path, 'PDFs'), stats)
+    pdi.save_output(output, os.path.join(collection_path, 'challenge1b_output.json'))
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+def _init_worker(ranking: str, cache: Optional[ExtractionCache], reranker: Optional[Reranker] = None,
+                 stream: bool = False, refinement: str = 'query', document_workers: int = 1):
+    # One warm pipeline per worker process, reused for every collection it is handed
+    global _worker_pdi
+    _worker_pdi = PersonaDocumentIntelligence(workers=document_workers, ranking=ranking, cache=cache,
+                                              reranker=reranker, stream=stream, refinement=refinement)
+
+def _process_in_worker(collection_path: str) -> Dict:
+    stats = process_collection(_worker_pdi, collection_path)
+    cache = _worker_pdi.doc_processor.cache
+    if cache is not None:
+        stats['cache_hits'], stats['cache_misses'] = cache.hits, cache.misses
+        cache.hits = cache.misses = 0
+    return stats
+
+def _error_stats(collection_path: str, error: Exception) -> Dict:
+    print(f"Error processing {collection_path}: {error}")
+    return {'collection': collection_path, 'status': 'error', 'documents': 0, 'pages': 0,
+            'sections': 0, 'seconds': 0.0}
+
+def run_collections(collections: List[str], workers: int = 1, ranking: str = 'keyword',
+                    cache: Optional[ExtractionCache] = None, reranker: Optional[Reranker] = None,
+                    stream: bool = False, refinement: str = 'query') -> List[Dict]:
+    if workers <= 1 or len(collections) <= 1:
+        # Collections run one after another here, so the workers go to document extraction instead
+        _init_worker(ranking, cache, reranker, stream, refinement, document_workers=workers)
+        results = []
+        for path in collections:
+            try:
+                results.append(_process_in_worker(path))
+            except Exception as e:
+                results.append(_error_stats(path, e))
+        return results
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(collections)), mp_context=_pool_context(),
+                             initializer=_init_worker, initargs=(ranking, cache, reranker, stream, refinement)) as pool:
+        futures = [pool.submit(_process_in_worker, path) for path in collections]
+        for path, future in zip(collections, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(_error_stats(path, e))
+    return results
+
+def print_summary(results: List[Dict], elapsed: float):
+    print(f"{'collection':<30}{'status':>7}{'docs':>6}{'pages':>7}{'sections':>10}{'seconds':>9}{'pages/s':>9}")
+    for stats in results:
+        rate = stats['pages'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        name = os.path.basename(stats['collection'].rstrip(os.sep))
+        print(f"{name[:29]:<30}{stats['status']:>7}{stats['documents']:>6}{stats['pages']:>7}"
+              f"{stats['sections']:>10}{stats['seconds']:>9.2f}{rate:>9.0f}")
+    ok = sum(stats['status'] == 'ok' for stats in results)
+    rate = len(results) / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {ok}/{len(results)} collections in {elapsed:.2f}s ({rate:.2f} collections/sec)")
+    if any('cache_hits' in stats for stats in results):
+        hits = sum(stats.get('cache_hits', 0) for stats in results)
+        misses = sum(stats.get('cache_misses', 0) for stats in results)
+        hit_rate = hits / (hits + misses) if hits + misses else 0.0
+        print(f"Extraction cache: {hits} hits, {misses} misses ({hit_rate:.0%} hit rate)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Process every collection under a root directory in one process')
+    parser.add_argument('root', help='directory holding Collection */challenge1b_input.json')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='collections processed in parallel (0 = one per CPU core, 1 = serial)')
+    parser.add_argument('--ranking', choices=RANKING_METHODS, default=default_ranking())
+    parser.add_argument('--cache', default=None,
+                        help='SQLite file caching extracted pages and sections by PDF content hash')
+    parser.add_argument('--cache-max-mb', type=float, default=512)
+    parser.add_argument('--rerank', default=None, metavar='ENCODER',
+                        help='rerank the top sections with an encoder: hashing or sentence-transformers:<model dir>')
+    parser.add_argument('--rerank-top-n', type=int, default=50)
+    parser.add_argument('--rerank-budget-ms', type=float, default=None,
+                        help='encoding time allowed per query; sections not reached get the mean similarity of the rest')
+    parser.add_argument('--refinement', choices=REFINEMENT_METHODS, default='query',
+                        help='query picks the sentences most relevant to the persona and task; leading keeps the opening ones')
+    parser.add_argument('--stream', action='store_true',
+                        help='score documents as they are extracted, keeping only the best sections in memory')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.root):
+        print(f"Collection root does not exist: {args.root}")
+        sys.exit(1)
+    collections = discover_collections(args.root)
+    if not collections:
+        print(f"No collections found under {args.root}")
+        sys.exit(1)
+
+    cache = None
+    if args.cache:
+        cache = ExtractionCache(args.cache, PROCESSOR_VERSION, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+
+    reranker = None
+    if args.rerank:
+        reranker = Reranker(get_encoder(args.rerank), top_n=args.rerank_top_n, budget_ms=args.rerank_budget_ms)
+
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+    started = time.perf_counter()
+    results = run_collections(collections, workers=workers, ranking=args.ranking, cache=cache, reranker=reranker,
+                              stream=args.stream, refinement=args.refinement)
+    print_summary(results, time.perf_counter() - started)
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,45 @@
 import re
-from typing import Dict, List
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from encoders import HashingEncoder
+from sentence_index import SentenceIndex
+
+REFINEMENT_METHODS = ('query', 'leading')
 
 class SectionExtractor:
-    def __init__(self):
-        pass
+    def __init__(self, refinement: str = 'query', max_indexes: int = 4096):
+        if refinement not in REFINEMENT_METHODS:
+            raise ValueError(f"Unknown refinement {refinement!r}, expected one of {', '.join(REFINEMENT_METHODS)}")
+        self.refinement = refinement
+        self.max_indexes = max_indexes
+        self.encoder = HashingEncoder(dimension=1 << 16)
+        self._indexes = OrderedDict()
+    
+    def sentence_index(self, content: str) -> SentenceIndex:
+        # Built the first time a section reaches the top-k, then kept (LRU) for every later query
+        index = self._indexes.get(content)
+        if index is None:
+            index = SentenceIndex(content, self.encoder, self.format_sentence)
+            self._indexes[content] = index
+            while len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(content)
+        return index
+    
+    def query_vector(self, query: str) -> np.ndarray:
+        _, columns, weights = self.encoder.encode_sparse([query])
+        vector = np.zeros(self.encoder.dimension, dtype=np.float32)
+        vector[columns] = weights
+        return vector
+    
+    def refine(self, content: str, query_vector: np.ndarray, max_length: int = 800) -> str:
+        # Sentences were formatted when the index was built, so a query only joins the chosen ones
+        index = self.sentence_index(content)
+        return self._end_sentence(' '.join(index.texts[i] for i in index.select(query_vector, max_length)))
     
     def extract_subsections(self, content: str, max_length: int = 800) -> str:
         sentences = re.split(r'(?<=[.!?])\s+', content)
@@ -22,8 +58,9 @@ class SectionExtractor:
             else:
                 break
         
-        result = ' '.join(refined_content)
-        
+        return self._end_sentence(' '.join(refined_content))
+    
+    def _end_sentence(self, result: str) -> str:
         if not result.endswith('.'):
             if result.endswith(',') or result.endswith(';'):
                 result = result[:-1] + '.'
@@ -32,22 +69,32 @@ class SectionExtractor:
         
         return result
     
-    def clean_and_format_text(self, text: str) -> str:
+    def format_sentence(self, text: str) -> str:
         text = re.sub(r'\s+', ' ', text)
         text = re.sub(r'([.!?])\s*([A-Z])', r'\1 \2', text)
-        text = text.strip()
+        return text.strip()
+    
+    def clean_and_format_text(self, text: str) -> str:
+        text = self.format_sentence(text)
         
         if not text.endswith('.'):
             text += '.'
         
         return text
     
-    def generate_subsection_analysis(self, ranked_sections: List[Dict]) -> List[Dict]:
+    def generate_subsection_analysis(self, ranked_sections: List[Dict], query: Optional[str] = None) -> List[Dict]:
         subsection_analysis = []
         
+        # Without a query (or with leading refinement) the opening sentences are kept
+        query_vector = None
+        if self.refinement == 'query' and query:
+            query_vector = self.query_vector(query)
+        
         for section in ranked_sections[:5]:
-            refined_text = self.extract_subsections(section['content'])
-            refined_text = self.clean_and_format_text(refined_text)
+            if query_vector is not None:
+                refined_text = self.refine(section['content'], query_vector)
+            else:
+                refined_text = self.clean_and_format_text(self.extract_subsections(section['content']))
             
             if len(refined_text.split()) >= 20:
                 subsection_analysis.append({
@@ -0,0 +1,38 @@
+import pickle
+from typing import List, Optional
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+class SectionIndex:
+    def __init__(self, vectorizer: TfidfVectorizer, key: Optional[tuple] = None):
+        self.vectorizer = clone(vectorizer)
+        self.key = key
+        self.matrix = None
+        self.size = 0
+
+    def fit(self, contents: List[str]) -> 'SectionIndex':
+        self.size = len(contents)
+        try:
+            # Rows are L2-normalised, so one sparse product with a query vector gives cosine scores
+            self.matrix = self.vectorizer.fit_transform(contents).tocsr()
+        except ValueError:
+            # No usable terms (empty collection or stop words only)
+            self.matrix = None
+        return self
+
+    def query(self, text: str) -> np.ndarray:
+        if self.matrix is None:
+            return np.zeros(self.size)
+        query_vector = self.vectorizer.transform([text])
+        return (self.matrix @ query_vector.T).toarray().ravel()
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'SectionIndex':
+        with open(path, 'rb') as f:
+            return pickle.load(f)
@@ -0,0 +1,60 @@
+import re
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from encoders import HashingEncoder
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+class SentenceIndex:
+    # One section split into sentences once: (start, end) offsets into the content plus a
+    # sparse hashed term vector per sentence, stored as parallel row/column/weight arrays.
+    # formatter, if given, is applied once here to produce the display text of each sentence
+    def __init__(self, content: str, encoder: HashingEncoder, formatter: Optional[Callable[[str], str]] = None):
+        spans = []
+        start = 0
+        for boundary in SENTENCE_BOUNDARY.finditer(content):
+            spans.append((start, boundary.start()))
+            start = boundary.end()
+        spans.append((start, len(content)))
+
+        self.sentences = []
+        offsets = []
+        for start, end in spans:
+            sentence = content[start:end].strip()
+            if sentence:
+                start = content.index(sentence, start)
+                self.sentences.append(sentence)
+                offsets.append((start, start + len(sentence)))
+        self.offsets = np.asarray(offsets, dtype=np.int64).reshape(-1, 2)
+        self.texts = [formatter(sentence) for sentence in self.sentences] if formatter else self.sentences
+        self.rows, self.columns, self.weights = encoder.encode_sparse(self.sentences)
+
+    def __len__(self) -> int:
+        return len(self.sentences)
+
+    def score(self, query_vector: np.ndarray) -> np.ndarray:
+        # Cosine similarity of every sentence with the query in one gather and bincount
+        return np.bincount(self.rows, weights=query_vector[self.columns] * self.weights,
+                           minlength=len(self.sentences))
+
+    def select(self, query_vector: np.ndarray, max_length: int = 800) -> List[int]:
+        # The opening sentence carries the section title, so it goes first; then the most
+        # relevant sentences (earlier ones on ties) while they fit in max_length. Repeated
+        # sentences are kept once. Returned in reading order
+        scores = self.score(query_vector)
+        if len(scores):
+            scores[0] = np.inf
+        order = np.lexsort((np.arange(len(scores)), -scores))
+        chosen = []
+        seen = set()
+        length = 0
+        for i in order.tolist():
+            sentence = self.sentences[i]
+            if sentence not in seen and length + len(sentence) <= max_length:
+                chosen.append(i)
+                seen.add(sentence)
+                length += len(sentence) + 1
+        chosen.sort()
+        return chosen
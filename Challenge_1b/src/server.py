@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from document_processor import PROCESSOR_VERSION
+from encoders import get_encoder
+from extraction_cache import ExtractionCache
+from main import PersonaDocumentIntelligence
+from persona_analyzer import RANKING_METHODS, default_ranking
+from reranker import Reranker
+from section_extractor import REFINEMENT_METHODS
+
+LATENCY_WINDOW = 1000
+MAX_BODY_BYTES = 1024 * 1024
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    # Nearest-rank percentile
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return round(sorted_values[index], 2)
+
+def collection_config(collection_path: str) -> Dict:
+    # Documents come from challenge1b_input.json when present, otherwise every PDF in PDFs/
+    input_file = os.path.join(collection_path, 'challenge1b_input.json')
+    if os.path.exists(input_file):
+        with open(input_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        if config.get('documents'):
+            return config
+    pdf_directory = os.path.join(collection_path, 'PDFs')
+    filenames = sorted(name for name in os.listdir(pdf_directory) if name.lower().endswith('.pdf'))
+    return {'documents': [{'filename': name} for name in filenames]}
+
+class QueryService:
+    def __init__(self, pdi: PersonaDocumentIntelligence, collection_path: str):
+        self.pdi = pdi
+        self.collection_path = collection_path
+        started = time.perf_counter()
+        config = collection_config(collection_path)
+        self.input_documents, self.processed_docs = pdi.load_documents(
+            config, os.path.join(collection_path, 'PDFs')
+        )
+        self.load_seconds = time.perf_counter() - started
+        # The pipeline keeps per-query caches (sentence indexes, embeddings, the TF-IDF index of hybrid
+        # ranking) that are not thread-safe; one query at a time keeps them consistent
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counts = {'queries': 0, 'errors': 0}
+
+    def warm_up(self):
+        # Only hybrid ranking has a per-collection index to fit; doing it now keeps it off the first real query
+        with self._lock:
+            self.pdi.answer_query(self.input_documents, self.processed_docs, 'General User', 'General analysis')
+
+    def answer(self, persona: str, job_description: str) -> Dict:
+        started = time.perf_counter()
+        with self._lock:
+            output = self.pdi.answer_query(self.input_documents, self.processed_docs, persona, job_description)
+            self._latencies.append((time.perf_counter() - started) * 1000)
+            self._counts['queries'] += 1
+        return output
+
+    def record_error(self):
+        with self._lock:
+            self._counts['errors'] += 1
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self._counts)
+        return dict(
+            counts,
+            collection=self.collection_path,
+            documents=len(self.processed_docs),
+            sections=sum(len(sections) for doc in self.processed_docs.values()
+                         for sections in doc['sections'].values()),
+            load_seconds=round(self.load_seconds, 3),
+            latency_ms={
+                'window': len(latencies),
+                'p50': percentile(latencies, 50),
+                'p90': percentile(latencies, 90),
+                'p99': percentile(latencies, 99),
+                'max': round(latencies[-1], 2) if latencies else None,
+            },
+        )
+
+def parse_query(payload: Dict) -> Dict:
+    # Accepts the challenge1b_input.json shape or plain {"persona": ..., "job_to_be_done": ...} strings
+    persona = payload.get('persona', 'General User')
+    job = payload.get('job_to_be_done', 'General analysis')
+    if isinstance(persona, dict):
+        persona = persona.get('role', 'General User')
+    if isinstance(job, dict):
+        job = job.get('task', 'General analysis')
+    if not isinstance(persona, str) or not isinstance(job, str):
+        raise ValueError('persona and job_to_be_done must be strings or {"role"}/{"task"} objects')
+    return {'persona': persona, 'job_description': job}
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'PersonaQueryService/1'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send_json(200, self.server.service.metrics())
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/query':
+            self._send_json(404, {'error': 'not found'})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._send_json(400, {'error': 'expected a JSON body with Content-Length'})
+            return
+        try:
+            query = parse_query(json.loads(self.rfile.read(length)))
+        except (ValueError, AttributeError) as e:
+            self.server.service.record_error()
+            self._send_json(400, {'error': f'bad query: {e}'})
+            return
+        try:
+            output = self.server.service.answer(**query)
+        except Exception as e:
+            self.server.service.record_error()
+            self._send_json(500, {'error': f'query failed: {e}'})
+            return
+        self._send_json(200, output)
+
+    def _send_json(self, code: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        # Unix socket peers have no host/port; BaseHTTPRequestHandler expects one
+        request, _ = super().get_request()
+        return request, ('unix', 0)
+
+def make_server(service: QueryService, host: str = '127.0.0.1', port: int = 8081,
+                unix_socket: Optional[str] = None):
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = UnixHTTPServer(unix_socket, QueryRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), QueryRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Answer persona/job queries against one warm collection')
+    parser.add_argument('collection_path')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--unix-socket', default=None, help='listen on this unix socket instead of TCP')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='processes extracting documents at startup (0 = one per CPU core)')
+    parser.add_argument('--ranking', choices=RANKING_METHODS, default=default_ranking())
+    parser.add_argument('--cache', default=None,
+                        help='SQLite file caching extracted pages and sections by PDF content hash')
+    parser.add_argument('--cache-max-mb', type=float, default=512)
+    parser.add_argument('--rerank', default=None, metavar='ENCODER',
+                        help='rerank the top sections with an encoder: hashing or sentence-transformers:<model dir>')
+    parser.add_argument('--rerank-top-n', type=int, default=50)
+    parser.add_argument('--rerank-budget-ms', type=float, default=None,
+                        help='encoding time allowed per query; sections not reached get the mean similarity of the rest')
+    parser.add_argument('--refinement', choices=REFINEMENT_METHODS, default='query',
+                        help='query picks the sentences most relevant to the persona and task; leading keeps the opening ones')
+    args = parser.parse_args(argv)
+
+    pdf_directory = os.path.join(args.collection_path, 'PDFs')
+    if not os.path.isdir(pdf_directory):
+        print(f"PDF directory not found: {pdf_directory}")
+        sys.exit(1)
+
+    cache = None
+    if args.cache:
+        cache = ExtractionCache(args.cache, PROCESSOR_VERSION, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    reranker = None
+    if args.rerank:
+        reranker = Reranker(get_encoder(args.rerank), top_n=args.rerank_top_n, budget_ms=args.rerank_budget_ms)
+    pdi = PersonaDocumentIntelligence(workers=args.workers if args.workers > 0 else os.cpu_count() or 1,
+                                      ranking=args.ranking, cache=cache, reranker=reranker,
+                                      refinement=args.refinement)
+    service = QueryService(pdi, args.collection_path)
+    if args.ranking == 'hybrid':
+        service.warm_up()
+    if cache is not None:
+        print(cache.stats())
+        cache.close()
+    server = make_server(service, args.host, args.port, args.unix_socket)
+    where = args.unix_socket or f'http://{args.host}:{args.port}'
+    print(f"Loaded {len(service.processed_docs)} documents in {service.load_seconds:.2f}s, serving queries on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.remove(args.unix_socket)
+
+if __name__ == '__main__':
+    main()